@@ -5,12 +5,18 @@ and the direction of each step is determined randomly.
 In this implementation of a 1D random walk, we will simulate a walker starting at position 0 and taking a series of steps 
 either to the left (-1) or to the right (+1) based on random choice. 
 We will be using a coin flip mechanism to decide the direction of each step.
+For long walks or many walkers, random_walks() does the same with NumPy arrays, and --benchmark compares the two.
+For walks too long to keep in memory, stream_walk() generates the path in chunks and keeps only running statistics.
 
 Author: Zane Francis
 """
 
+import argparse
 import random
+import time
+
 import matplotlib.pyplot as plt
+import numpy as np
 
 def random_walk_1d(steps):
     # Starting position
@@ -31,10 +37,153 @@ def random_walk_1d(steps):
         walk.append(position)
     return walk
 
+def position_dtype(steps):
+    # Smallest signed integer type that can hold any position reachable in `steps` steps
+    for dtype in (np.int8, np.int16, np.int32):
+        if steps <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+def random_steps(rng, shape):
+    # One random bit per step: every random byte gives 8 steps, turned into -1/+1 in place
+    count = int(np.prod(shape))
+    random_bytes = np.frombuffer(rng.bytes((count + 7) // 8), dtype=np.uint8)
+    steps = np.unpackbits(random_bytes, count=count).view(np.int8).reshape(shape)
+    steps *= 2
+    steps -= 1
+    return steps
+
+def random_walks(steps, walkers=1, seed=None):
+    """Simulate `walkers` independent walks at once; row i holds walker i's positions, starting at 0."""
+    rng = np.random.default_rng(seed)
+    dtype = position_dtype(steps)
+    walks = np.zeros((walkers, steps + 1), dtype=dtype)
+    np.cumsum(random_steps(rng, (walkers, steps)), axis=1, dtype=dtype, out=walks[:, 1:])
+    return walks
+
+def benchmark(step_counts=(10_000, 100_000, 1_000_000), walkers=1000, walker_steps=10_000):
+    # Compare the Python loop with the NumPy engine, then time many walkers at once
+    print(f"{'steps':>10} {'loop':>10} {'numpy':>10} {'speedup':>8}")
+    random_walks(10)  # Warm-up so the first row does not include one-off set-up costs
+    for steps in step_counts:
+        start = time.perf_counter()
+        random_walk_1d(steps)
+        loop_time = time.perf_counter() - start
+        start = time.perf_counter()
+        random_walks(steps)
+        numpy_time = time.perf_counter() - start
+        print(f"{steps:>10} {loop_time:>9.3f}s {numpy_time:>9.4f}s {loop_time / numpy_time:>7.0f}x")
+    start = time.perf_counter()
+    walks = random_walks(walker_steps, walkers)
+    elapsed = time.perf_counter() - start
+    print(f"{walkers} walkers x {walker_steps} steps: {elapsed:.3f}s "
+          f"({walkers * walker_steps / elapsed / 1e6:.0f}M steps/s, {walks.dtype}, {walks.nbytes / 2 ** 20:.1f} MiB)")
+
+class WalkStatistics:
+    """Running statistics of one walk, updated a chunk of positions at a time in constant memory.
+
+    Tracks the final, highest and lowest positions, the first step at which each of `levels`
+    is reached, zero crossings (sign changes), steps spent above zero and, when bin_width is
+    set, the min/max envelope of the path over bins of bin_width steps.
+    """
+
+    def __init__(self, levels=(), total_steps=0, bin_width=0):
+        self.steps = 0
+        self.position = 0
+        self.max_position = 0
+        self.min_position = 0
+        self.first_passage = {level: None for level in levels}
+        self.zero_crossings = 0
+        self.time_positive = 0
+        self._last_sign = 0
+        self.bin_width = bin_width
+        bins = -(-total_steps // bin_width) if bin_width else 0
+        self._low = np.zeros(bins, dtype=np.int64)
+        self._high = np.zeros(bins, dtype=np.int64)
+
+    def update(self, positions):
+        # positions are the walk at steps self.steps + 1, self.steps + 2, ...
+        low, high = int(positions.min()), int(positions.max())
+        self.max_position = max(self.max_position, high)
+        self.min_position = min(self.min_position, low)
+        for level, passage in self.first_passage.items():
+            # Steps are +/-1, so any level between the chunk's min and max is hit exactly
+            if passage is None and low <= level <= high:
+                self.first_passage[level] = self.steps + int(np.argmax(positions == level)) + 1
+
+        signs = np.sign(positions)
+        nonzero = signs[signs != 0]
+        if nonzero.size:
+            self.zero_crossings += int(np.count_nonzero(nonzero[1:] != nonzero[:-1]))
+            self.zero_crossings += bool(self._last_sign and nonzero[0] != self._last_sign)
+            self._last_sign = nonzero[-1]
+        self.time_positive += int(np.count_nonzero(positions > 0))
+
+        if self.bin_width:
+            # Chunks start on a bin boundary, so every bin lies inside a single chunk
+            starts = np.arange(0, positions.size, self.bin_width)
+            first = self.steps // self.bin_width
+            self._low[first:first + starts.size] = np.minimum.reduceat(positions, starts)
+            self._high[first:first + starts.size] = np.maximum.reduceat(positions, starts)
+
+        self.steps += positions.size
+        self.position = int(positions[-1])
+
+    def envelope(self):
+        # (first step of each bin, lowest position in it, highest position in it)
+        bins = -(-self.steps // self.bin_width) if self.bin_width else 0
+        return np.arange(bins) * self.bin_width + 1, self._low[:bins], self._high[:bins]
+
+    def __str__(self):
+        passages = ', '.join(f"{level}: {'not reached' if step is None else f'step {step}'}"
+                             for level, step in self.first_passage.items())
+        lines = [
+            f"Steps: {self.steps}",
+            f"Final position: {self.position}",
+            f"Highest / lowest position: {self.max_position} / {self.min_position}",
+            f"Zero crossings: {self.zero_crossings}",
+            f"Time spent positive: {self.time_positive} steps "
+            f"({self.time_positive / self.steps:.1%})" if self.steps else "Time spent positive: 0 steps",
+        ]
+        if passages:
+            lines.append(f"First passage times: {passages}")
+        return '\n'.join(lines)
+
+def stream_walk(steps, chunk_size=1_000_000, levels=(), seed=None, envelope_bins=2000):
+    """Simulate one walk of `steps` steps chunk by chunk and return its WalkStatistics.
+
+    Memory depends on chunk_size and envelope_bins, not on steps.
+    """
+    rng = np.random.default_rng(seed)
+    bin_width = -(-steps // envelope_bins) if envelope_bins else 0
+    if bin_width:
+        # Round chunks to whole envelope bins
+        chunk_size = max(bin_width, chunk_size // bin_width * bin_width)
+    dtype = position_dtype(steps)
+    stats = WalkStatistics(levels, steps, bin_width)
+    for start in range(0, steps, chunk_size):
+        positions = np.cumsum(random_steps(rng, (min(chunk_size, steps - start),)), dtype=dtype)
+        # Carry the position over from the previous chunk
+        positions += dtype.type(stats.position)
+        stats.update(positions)
+    return stats
+
 # Function to plot the random walk
-def plot_walk(walk):
+def plot_walk(walk, max_points=10_000):
     plt.figure(figsize=(10, 6))
-    plt.plot(walk)
+    if isinstance(walk, WalkStatistics):
+        # A streamed walk only has its min/max envelope
+        steps, low, high = walk.envelope()
+        plt.fill_between(steps, low, high, step='post', linewidth=0.5)
+    elif np.ndim(walk) == 1 and len(walk) > max_points:
+        # Long paths are drawn as a min/max envelope; every excursion stays visible
+        stats = WalkStatistics(bin_width=-(-len(walk) // max_points), total_steps=len(walk))
+        stats.update(np.asarray(walk))
+        steps, low, high = stats.envelope()
+        plt.fill_between(steps - 1, low, high, step='post', linewidth=0.5)
+    else:
+        # Several walkers (a 2D array) are drawn as one line each
+        plt.plot(np.transpose(walk))
     plt.title("1D Random Walk")
     plt.xlabel("Number of Steps")
     plt.ylabel("Position")
@@ -42,8 +191,35 @@ def plot_walk(walk):
     plt.show()
 
 if __name__ == "__main__":
-    # Number of steps for the random walk
-    num_steps = 10000
-    walk = random_walk_1d(num_steps)
-    plot_walk(walk)
-    print(f"Final position after {num_steps} steps: {walk[-1]}")
+    parser = argparse.ArgumentParser(description="Simulate and plot 1D random walks.")
+    parser.add_argument('--steps', type=int, default=10000, help="number of steps per walk")
+    parser.add_argument('--walkers', type=int, default=1, help="number of independent walkers")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for repeatable walks")
+    parser.add_argument('--benchmark', action='store_true', help="compare the loop and NumPy engines")
+    parser.add_argument('--stream', action='store_true',
+                        help="generate one walk in chunks and report running statistics (constant memory)")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000, help="steps per chunk in streaming mode")
+    parser.add_argument('--levels', type=int, nargs='*', default=[],
+                        help="positions whose first passage times are reported in streaming mode")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+    elif args.stream:
+        start = time.perf_counter()
+        stats = stream_walk(args.steps, args.chunk_size, args.levels, args.seed)
+        elapsed = time.perf_counter() - start
+        print(stats)
+        print(f"Simulated in {elapsed:.2f}s ({args.steps / elapsed / 1e6:.0f}M steps/s)")
+        plot_walk(stats)
+    else:
+        # Number of steps for the random walk
+        num_steps = args.steps
+        walks = random_walks(num_steps, args.walkers, args.seed)
+        plot_walk(walks[0] if args.walkers == 1 else walks)
+        if args.walkers == 1:
+            print(f"Final position after {num_steps} steps: {walks[0, -1]}")
+        else:
+            finals = walks[:, -1]
+            print(f"Final positions after {num_steps} steps: mean {finals.mean():.2f}, "
+                  f"std {finals.std():.2f} (expected {num_steps ** 0.5:.2f})")
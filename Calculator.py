@@ -5,22 +5,797 @@ numerics, algebra, calculus, statistical probability, and plotting functions.
 Author: Zane Francis
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
-import sympy as sp
-from sympy.parsing.sympy_parser import (
-    parse_expr,
-    standard_transformations,
-    implicit_multiplication_application,
-    convert_xor,
-)
+import atexit
+import importlib
+import io
+import math
+import numbers
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+from collections.abc import Iterator
+from functools import lru_cache
+from itertools import islice
+
+#-----------------------------------------------------
+# Heavy dependencies are imported on first use so that
+# `import Calculator` stays fast for short-lived workers
+#-----------------------------------------------------
+class _LazyModule:
+    """Stand-in for a module that is only imported when one of its attributes is first used."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+plt = _LazyModule('matplotlib.pyplot')
+mpl_figure = _LazyModule('matplotlib.figure')
+np = _LazyModule('numpy')
+sp = _LazyModule('sympy')
+sympy_parser = _LazyModule('sympy.parsing.sympy_parser')
+# Only needed by the worker pools, the batch command line, profiling and the persistent cache
+argparse = _LazyModule('argparse')
+json = _LazyModule('json')
+cProfile = _LazyModule('cProfile')
+hashlib = _LazyModule('hashlib')
+pickle = _LazyModule('pickle')
+sqlite3 = _LazyModule('sqlite3')
+pstats = _LazyModule('pstats')
+futures = _LazyModule('concurrent.futures')
+inspect = _LazyModule('inspect')
+multiprocessing = _LazyModule('multiprocessing')
+
+#-----------------------------------------------------
+# Shared caches used by the Algebra, Calculus and Plotting classes
+#-----------------------------------------------------
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used cache with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize=512):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_create(self, key, factory):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Build outside the lock so a slow factory does not block other threads
+        value = factory()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+@lru_cache(maxsize=None)
+def implicit_transformations():
+    # Transformations used for user-typed polynomials such as "2x^2 + 3x"
+    return sympy_parser.standard_transformations + (
+        sympy_parser.implicit_multiplication_application,
+        sympy_parser.convert_xor,
+    )
+
+# Parsed expressions keyed by (expression, variable names, parser mode)
+expression_cache = LRUCache(maxsize=512)
+
+def parse_expression(expr, variables=(), mode='sympify'):
+    """Parse expr once and reuse the result for identical (expr, variables, mode) requests.
+
+    mode='sympify' uses sp.sympify; mode='implicit' uses parse_expr with implicit
+    multiplication and ^ as power, binding each name in variables to a Symbol.
+    """
+    if isinstance(variables, str):
+        variables = (variables,)
+    variables = tuple(variables)
+
+    def build():
+        if mode == 'sympify':
+            return sp.sympify(expr)
+        if mode == 'implicit':
+            local_dict = {name: sp.Symbol(name) for name in variables}
+            return sympy_parser.parse_expr(expr, transformations=implicit_transformations(), local_dict=local_dict)
+        raise ValueError(f"Unsupported parser mode: {mode}")
+
+    try:
+        key = (type(expr), expr, variables, mode)
+        hash(key)
+    except TypeError:
+        # Unhashable input (e.g. a list) cannot be cached; parse it directly
+        return build()
+    return expression_cache.get_or_create(key, build)
+
+def expression_cache_stats():
+    return expression_cache.stats()
+
+def clear_expression_cache():
+    expression_cache.clear()
+
+# Compiled NumPy functions keyed by (expression, variable names)
+function_cache = LRUCache(maxsize=256)
+
+def _scalar_gamma(x):
+    # Overflow and the poles at 0, -1, -2, ... both give inf, so 1/gamma and 1/factorial go to 0
+    try:
+        return math.gamma(x)
+    except (OverflowError, ValueError):
+        return math.inf
+
+def _scalar_loggamma(x):
+    try:
+        return math.lgamma(x)
+    except (OverflowError, ValueError):
+        return math.inf
+
+@lru_cache(maxsize=None)
+def _special_functions():
+    # sympy functions that NumPy lacks, applied element-wise through the math module
+    gamma = np.frompyfunc(_scalar_gamma, 1, 1)
+    loggamma = np.frompyfunc(_scalar_loggamma, 1, 1)
+    return {
+        'gamma': lambda x: np.asarray(gamma(x), dtype=float),
+        'loggamma': lambda x: np.asarray(loggamma(x), dtype=float),
+        'factorial': lambda x: np.asarray(gamma(np.add(x, 1)), dtype=float),
+    }
+
+def compile_function(expr, variables):
+    """Return a NumPy-vectorized callable for expr, compiling it with sp.lambdify only once."""
+    if isinstance(variables, str):
+        variables = (variables,)
+    variables = tuple(variables)
+
+    def build():
+        symbols = [sp.Symbol(name) for name in variables]
+        body = expr
+        if isinstance(body, sp.Basic) and body.has(sp.binomial):
+            # lambdify writes binomials as gamma ratios, which turn into inf/inf long before the binomial
+            # itself overflows; the difference of log-gammas stays finite
+            body = body.replace(sp.binomial, lambda n, k: sp.exp(
+                sp.loggamma(n + 1) - sp.loggamma(k + 1) - sp.loggamma(n - k + 1)))
+        return sp.lambdify(symbols, body, modules=[_special_functions(), 'numpy'])
+
+    return function_cache.get_or_create((expr, variables), build)
+
+def function_cache_stats():
+    return function_cache.stats()
+
+def clear_function_cache():
+    function_cache.clear()
+
+def evaluate_compiled(compiled, arrays):
+    # Call a compiled function on arrays; constant expressions come back as scalars, so match the input shape
+    with np.errstate(all='ignore'):
+        values = compiled(*arrays)
+    shape = np.broadcast_shapes(*(np.shape(a) for a in arrays))
+    if np.shape(values) != shape:
+        return np.broadcast_to(values, shape).astype(np.result_type(values, float))
+    return np.asarray(values)
+
+def is_batch(value):
+    # Arrays and other iterables (but not strings) are computed as one vectorized batch
+    return not isinstance(value, (str, bytes)) and (hasattr(value, '__array__') or hasattr(value, '__iter__'))
+
+#-----------------------------------------------------
+# Numeric fallbacks for symbolic operations
+#-----------------------------------------------------
+# Result of an operation that may be answered symbolically or numerically
+EvaluationResult = namedtuple('EvaluationResult', ['value', 'method', 'error_estimate'])
+
+def iter_partial_sums(f, start, stop, chunk_size=1_000_000):
+    """Sum the vectorized term f(n) for n = start..stop in chunks, yielding (n, partial_sum, error_bound) per chunk.
+
+    Each chunk is summed pairwise by NumPy and chunks are combined with Neumaier (compensated)
+    addition, so rounding error grows with log(chunk_size) rather than with the number of terms.
+    """
+    eps = float(np.finfo(np.float64).eps)
+    # Short sums need no more buffer than they have terms
+    chunk_size = max(1, min(chunk_size, stop - start + 1))
+    offsets = np.arange(chunk_size, dtype=np.float64)
+    buffer = np.empty(chunk_size, dtype=np.float64)
+    total = compensation = magnitude = 0.0
+    for first in range(start, stop + 1, chunk_size):
+        count = min(chunk_size, stop - first + 1)
+        n = np.add(offsets[:count], first, out=buffer[:count])
+        terms = np.real(evaluate_compiled(f, [n]))
+        chunk_sum = float(np.sum(terms))
+        magnitude += float(np.sum(np.abs(terms)))
+
+        running = total + chunk_sum
+        if abs(total) >= abs(chunk_sum):
+            compensation += (total - running) + chunk_sum
+        else:
+            compensation += (chunk_sum - running) + total
+        total = running
+        yield first + count - 1, total + compensation, eps * math.log2(max(count, 2)) * magnitude
+
+def find_real_roots(f, df, a, b, samples=2001, xtol=1e-12, max_iterations=100):
+    """Return (roots, error_estimate) for all real roots of the vectorized f on [a, b].
+
+    f is sampled on a grid and every sign change becomes a bracket. All brackets are refined
+    together by Newton steps on f / df, falling back to bisection whenever a step leaves its
+    bracket. Grid points where |f| dips towards zero without a sign change are polished with
+    Newton steps to catch even-multiplicity roots. Sign changes at poles are discarded.
+    """
+    x = np.linspace(a, b, samples)
+    y = np.real(evaluate_compiled(f, [x]))
+    finite = np.isfinite(y)
+    scale = max(1.0, float(np.median(np.abs(y[finite])))) if finite.any() else 1.0
+    ftol = 1e-8 * scale
+    roots = [x[y == 0]]
+    error = 0.0
+
+    sign = np.sign(y)
+    bracketed = (sign[:-1] * sign[1:] < 0) & finite[:-1] & finite[1:]
+    lo, hi, f_lo = x[:-1][bracketed], x[1:][bracketed], y[:-1][bracketed]
+    root = (lo + hi) / 2
+    step = np.full(root.shape, np.inf)
+    for _ in range(max_iterations):
+        if not root.size:
+            break
+        f_root = np.real(evaluate_compiled(f, [root]))
+        df_root = np.real(evaluate_compiled(df, [root]))
+        # Keep the sign change inside [lo, hi]
+        same_side = np.sign(f_root) == np.sign(f_lo)
+        lo = np.where(same_side, root, lo)
+        f_lo = np.where(same_side, f_root, f_lo)
+        hi = np.where(same_side, hi, root)
+        with np.errstate(all='ignore'):
+            newton = root - f_root / df_root
+        safe = np.isfinite(newton) & (newton > lo) & (newton < hi)
+        candidate = np.where(safe, newton, (lo + hi) / 2)
+        step = np.where(f_root == 0, 0.0, np.abs(candidate - root))
+        root = np.where(f_root == 0, root, candidate)
+        if np.all(step <= xtol * (1 + np.abs(root))):
+            break
+    if root.size:
+        # A sign change across a pole converges to the pole, where |f| is huge rather than ~0
+        genuine = np.abs(np.real(evaluate_compiled(f, [root]))) <= ftol
+        roots.append(root[genuine])
+        error = float(step[genuine].max(initial=0.0))
+
+    # Even-multiplicity roots: local minima of |f| between samples of the same sign
+    magnitude = np.abs(y)
+    dips = np.flatnonzero((magnitude[1:-1] < magnitude[:-2]) & (magnitude[1:-1] <= magnitude[2:])
+                          & (sign[:-2] == sign[2:]) & (sign[1:-1] != 0) & finite[1:-1]) + 1
+    if dips.size:
+        guess, lo, hi = x[dips], x[dips - 1], x[dips + 1]
+        for _ in range(max_iterations):
+            with np.errstate(all='ignore'):
+                guess = np.clip(guess - np.real(evaluate_compiled(f, [guess]))
+                                / np.real(evaluate_compiled(df, [guess])), lo, hi)
+            guess = np.nan_to_num(guess, nan=lo)
+        touching = np.abs(np.real(evaluate_compiled(f, [guess]))) <= ftol
+        roots.append(guess[touching])
+        if touching.any():
+            # Multiple roots converge linearly; report the remaining Newton step as the error
+            error = max(error, math.sqrt(ftol / scale) * (b - a) / samples)
+
+    roots = np.sort(np.concatenate(roots))
+    # Merge duplicates found by more than one route
+    if roots.size:
+        keep = np.concatenate([[True], np.diff(roots) > 1e-9 * (1 + np.abs(roots[1:]))])
+        roots = roots[keep]
+    return roots.tolist(), error
+
+# 15-point Gauss-Kronrod rule: positive Kronrod nodes, Kronrod weights, and the
+# weights of the embedded 7-point Gauss rule (which uses every other node)
+_GK_NODES = (0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+             0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+             0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+             0.207784955007898467600689403773245)
+_GK_KRONROD_WEIGHTS = (0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+                       0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+                       0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+                       0.204432940075298892414161999234649, 0.209482141084727828012999174891714)
+_GK_GAUSS_WEIGHTS = (0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+                     0.381830050505118944950369775488975, 0.417959183673469387755102040816327)
+
+@lru_cache(maxsize=None)
+def _gauss_kronrod_rule():
+    nodes = np.array([-x for x in _GK_NODES] + [0.0] + list(reversed(_GK_NODES)))
+    kronrod = np.array(_GK_KRONROD_WEIGHTS + tuple(reversed(_GK_KRONROD_WEIGHTS[:7])))
+    gauss = np.zeros(15)
+    gauss[1:7:2] = _GK_GAUSS_WEIGHTS[:3]
+    gauss[7] = _GK_GAUSS_WEIGHTS[3]
+    gauss[9:15:2] = _GK_GAUSS_WEIGHTS[2::-1]
+    return nodes, kronrod, gauss
+
+def _to_finite_interval(f, a, b):
+    # Map infinite limits onto a finite interval (the rule never evaluates the endpoints)
+    if math.isinf(a) and math.isinf(b):
+        return (lambda t: f(t / (1 - t ** 2)) * (1 + t ** 2) / (1 - t ** 2) ** 2), -1.0, 1.0
+    if math.isinf(b):
+        return (lambda t: f(a + t / (1 - t)) / (1 - t) ** 2), 0.0, 1.0
+    if math.isinf(a):
+        return (lambda t: f(b - (1 - t) / t) / t ** 2), 0.0, 1.0
+    return f, a, b
+
+class QuadratureError(ArithmeticError):
+    """Raised when adaptive quadrature runs out of subintervals before meeting its tolerance."""
+
+    def __init__(self, value, error_estimate, max_intervals):
+        super().__init__(f"Integral did not converge within {max_intervals} subintervals "
+                         f"(estimate {value:g}, error estimate {error_estimate:g})")
+        self.value = value
+        self.error_estimate = error_estimate
+
+def adaptive_quadrature(f, a, b, tol=1e-10, max_intervals=100_000):
+    """Integrate the vectorized function f over [a, b] with globally adaptive Gauss-Kronrod (7, 15).
+
+    Every pass evaluates all unresolved subintervals in one call to f and bisects the ones whose
+    error estimate exceeds their share of the tolerance. Returns (value, error_estimate), or raises
+    QuadratureError if more than max_intervals subintervals would be needed.
+    """
+    a, b = float(a), float(b)
+    if a == b:
+        return 0.0, 0.0
+    if a > b:
+        value, error = adaptive_quadrature(f, b, a, tol, max_intervals)
+        return -value, error
+    f, a, b = _to_finite_interval(f, a, b)
+
+    nodes, kronrod, gauss = _gauss_kronrod_rule()
+    lo, hi = np.array([a]), np.array([b])
+    total, total_error = 0.0, 0.0
+    width = b - a
+    while lo.size:
+        center, half = (lo + hi) / 2, (hi - lo) / 2
+        x = center[:, None] + half[:, None] * nodes
+        fx = evaluate_compiled(f, [x]).real
+        k_estimate = half * (fx @ kronrod)
+        error = np.abs(k_estimate - half * (fx @ gauss))
+
+        # Absolute/relative tolerance shared out in proportion to interval width
+        estimate = abs(total + k_estimate.sum())
+        allowed = max(tol, tol * estimate) * (2 * half) / width
+        done = (error <= allowed) | (half < 1e-15 * np.maximum(1.0, np.abs(center)))
+        if lo.size * 2 > max_intervals and not done.all():
+            raise QuadratureError(float(total + k_estimate.sum()), float(total_error + error.sum()),
+                                  max_intervals)
+
+        total += k_estimate[done].sum()
+        total_error += error[done].sum()
+        lo, hi, center = lo[~done], hi[~done], center[~done]
+        lo, hi = np.concatenate([lo, center]), np.concatenate([center, hi])
+    return float(total), float(total_error)
+
+
+#-----------------------------------------------------
+# Time-bounded symbolic execution in a pool of warm worker processes
+#-----------------------------------------------------
+# sympy functions that may be sent to a worker process
+SYMBOLIC_OPERATIONS = frozenset({
+    'solve', 'integrate', 'limit', 'summation', 'series', 'diff',
+    'factor', 'expand', 'simplify', 'nsimplify',
+})
+
+class SymbolicTimeout(TimeoutError):
+    """Raised when a symbolic operation does not finish within its time limit."""
+
+class SymbolicWorkerError(RuntimeError):
+    """Raised when a worker process dies mid-call, for example after exceeding its memory limit."""
+
+def _symbolic_worker_main(connection, memory_limit):
+    # Entry point of each worker process: cap memory, import sympy once, then serve calls until told to stop
+    if memory_limit:
+        try:
+            import resource
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        except (ImportError, ValueError, OSError):
+            pass  # Not supported on this platform; run without a memory cap
+    import sympy
+    connection.send(('ready', None))
+
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        operation, args, kwargs = message
+        try:
+            reply = ('ok', getattr(sympy, operation)(*args, **kwargs))
+        except BaseException as exc:
+            reply = ('error', exc)
+        try:
+            connection.send(reply)
+        except Exception as exc:  # Result or exception could not be pickled
+            connection.send(('error', SymbolicWorkerError(f"{operation} result could not be returned: {exc}")))
+
+class _SymbolicWorker:
+
+    def __init__(self, context, memory_limit):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_symbolic_worker_main,
+            args=(child_connection, memory_limit),
+            daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+        self.ready = False
+
+    def wait_ready(self):
+        # Start-up (importing sympy) is not counted against any call's timeout
+        if not self.ready:
+            self.connection.recv()
+            self.ready = True
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+        self.connection.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+class SymbolicExecutor:
+    """Run sympy operations in reusable worker processes with per-call timeouts, cancellation and memory caps.
+
+    Workers are started up front and import sympy immediately, so calls do not pay the import.
+    A worker that times out, is cancelled or dies is killed and replaced; the others keep serving.
+    """
+
+    def __init__(self, workers=None, timeout=30.0, memory_limit=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = queue.Queue()
+        for _ in range(self.workers):
+            self._idle.put(_SymbolicWorker(self._context, memory_limit))
+        self._dispatcher = futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='symbolic')
+        self._cancel_events = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, operation, *args, timeout=None, **kwargs):
+        # Returns a concurrent.futures.Future; independent calls run in parallel across workers
+        if operation not in SYMBOLIC_OPERATIONS:
+            raise ValueError(f"Unsupported symbolic operation: {operation}")
+        if self._closed:
+            raise RuntimeError("SymbolicExecutor has been shut down")
+        cancel_event = threading.Event()
+        future = self._dispatcher.submit(
+            self._call, operation, args, kwargs, timeout or self.timeout, cancel_event
+        )
+        with self._lock:
+            self._cancel_events[future] = cancel_event
+        future.add_done_callback(self._forget)
+        return future
+
+    def run(self, operation, *args, timeout=None, **kwargs):
+        return self.submit(operation, *args, timeout=timeout, **kwargs).result()
+
+    def cancel(self, future):
+        # Pending calls are dropped; a running call has its worker killed
+        if future.cancel():
+            return True
+        with self._lock:
+            cancel_event = self._cancel_events.get(future)
+        if cancel_event is None:
+            return False
+        cancel_event.set()
+        return True
+
+    def _forget(self, future):
+        with self._lock:
+            self._cancel_events.pop(future, None)
+
+    def _replace(self, worker):
+        worker.kill()
+        if not self._closed:
+            self._idle.put(_SymbolicWorker(self._context, self.memory_limit))
+
+    def _call(self, operation, args, kwargs, timeout, cancel_event):
+        worker = self._idle.get()
+        try:
+            worker.wait_ready()
+        except (EOFError, OSError):
+            self._replace(worker)
+            raise SymbolicWorkerError("Worker failed to start")
+        try:
+            worker.connection.send((operation, args, kwargs))
+        except Exception:
+            self._idle.put(worker)
+            raise
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            # Wake up regularly so cancellation is noticed while waiting
+            if worker.connection.poll(max(0.0, min(remaining, 0.1))):
+                try:
+                    status, payload = worker.connection.recv()
+                except (EOFError, OSError):
+                    self._replace(worker)
+                    raise SymbolicWorkerError(f"Worker exited during {operation} (memory limit exceeded?)")
+                self._idle.put(worker)
+                if status == 'ok':
+                    return payload
+                raise payload
+            if cancel_event.is_set():
+                self._replace(worker)
+                raise futures.CancelledError(f"{operation} was cancelled")
+            if not worker.process.is_alive():
+                self._replace(worker)
+                raise SymbolicWorkerError(f"Worker exited during {operation} (memory limit exceeded?)")
+            if remaining <= 0:
+                self._replace(worker)
+                raise SymbolicTimeout(f"{operation} did not finish within {timeout} s")
+
+    def shutdown(self):
+        self._closed = True
+        with self._lock:
+            pending = list(self._cancel_events.values())
+        for cancel_event in pending:
+            cancel_event.set()
+        self._dispatcher.shutdown(wait=True, cancel_futures=True)
+        while not self._idle.empty():
+            self._idle.get_nowait().stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+_symbolic_executor = None
+_symbolic_executor_lock = threading.Lock()
+
+# One warm worker is plenty for timeouts and time budgets; ask for more explicitly
+# with configure_symbolic_executor
+_symbolic_executor_options = {'workers': 1}
+
+def configure_symbolic_executor(workers=None, timeout=30.0, memory_limit=None, start=True):
+    """Replace the shared executor used by calls that pass a timeout.
+
+    With start=False no worker is started until the first call that needs one.
+    """
+    global _symbolic_executor, _symbolic_executor_options
+    with _symbolic_executor_lock:
+        if _symbolic_executor is not None:
+            _symbolic_executor.shutdown()
+            _symbolic_executor = None
+        _symbolic_executor_options = {'workers': workers, 'timeout': timeout, 'memory_limit': memory_limit}
+        if start:
+            _symbolic_executor = SymbolicExecutor(**_symbolic_executor_options)
+        return _symbolic_executor
+
+def get_symbolic_executor():
+    global _symbolic_executor
+    with _symbolic_executor_lock:
+        if _symbolic_executor is None:
+            _symbolic_executor = SymbolicExecutor(**_symbolic_executor_options)
+        return _symbolic_executor
+
+@atexit.register
+def _shutdown_symbolic_executor():
+    if _symbolic_executor is not None:
+        _symbolic_executor.shutdown()
+
+def run_symbolic(operation, *args, timeout=None, **kwargs):
+    # Without a timeout the call runs in-process, exactly as before
+    if timeout is None:
+        return getattr(sp, operation)(*args, **kwargs)
+    return get_symbolic_executor().run(operation, *args, timeout=timeout, **kwargs)
+
+#-----------------------------------------------------
+# Optional persistent cache for expensive symbolic results
+#-----------------------------------------------------
+class PersistentCache:
+    """SQLite-backed store of pickled sympy results that survives restarts and is shared by processes.
+
+    Keys hash the operation name with the canonical (srepr) form of the expression and its
+    arguments, so "x + 1" and "1 + x" share an entry. The database runs in WAL mode with a busy
+    timeout, so several processes can read and write at once. Once the stored results exceed
+    max_bytes, the least recently used ones are evicted.
+    """
+
+    # Seconds a write waits for another process's lock; recency updates on reads barely wait at all
+    BUSY_TIMEOUT = 30.0
+    RECENCY_BUSY_TIMEOUT = 0.005
+
+    def __init__(self, path, max_bytes=256 * 1024 ** 2):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def make_key(operation, expr, args=()):
+        def canonical(value):
+            return sp.srepr(value) if isinstance(value, sp.Basic) else repr(value)
+        payload = repr((operation, canonical(expr), tuple(canonical(arg) for arg in args)))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key, default=None):
+        connection = self._connection()
+        row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        # A hit must not queue behind writers for the full busy timeout just to refresh its recency
+        connection.execute(f"PRAGMA busy_timeout = {int(self.RECENCY_BUSY_TIMEOUT * 1000)}")
+        try:
+            connection.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.OperationalError:
+            pass  # Another process holds the write lock; recency is only a hint
+        finally:
+            connection.execute(f"PRAGMA busy_timeout = {int(self.BUSY_TIMEOUT * 1000)}")
+        return pickle.loads(row[0])
+
+    def set(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time()),
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self, connection):
+        excess = connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for key, size in connection.execute("SELECT key, size FROM results ORDER BY accessed"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM results WHERE key = ?", victims)
+
+    def get_or_compute(self, operation, expr, args, compute):
+        key = self.make_key(operation, expr, args)
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        self._connection().execute("DELETE FROM results")
+
+    def stats(self):
+        count, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': count, 'bytes': size,
+                'max_bytes': self.max_bytes}
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+persistent_cache = None
+
+def enable_persistent_cache(path='calculator_cache.sqlite3', max_bytes=256 * 1024 ** 2):
+    """Keep factor_polynomial, integral, limit and taylor_series results on disk at path."""
+    global persistent_cache
+    persistent_cache = PersistentCache(path, max_bytes)
+    return persistent_cache
+
+def disable_persistent_cache():
+    global persistent_cache
+    if persistent_cache is not None:
+        persistent_cache.close()
+    persistent_cache = None
+
+def cached_result(operation, expr, args, compute):
+    # Straight through to compute() unless the persistent cache is enabled
+    if persistent_cache is None:
+        return compute()
+    return persistent_cache.get_or_compute(operation, expr, args, compute)
 
 #-----------------------------------------------------
 # This class handles various numeric computations
 #-----------------------------------------------------
 class Numerics:
 
+    # NumPy ufunc names used when basic_operations receives arrays
+    _ARRAY_OPERATIONS = {'+': 'add', '-': 'subtract', '*': 'multiply', '/': 'true_divide'}
+
+    @staticmethod
+    def _as_array(value):
+        if hasattr(value, '__array__') or not hasattr(value, '__iter__'):
+            return np.asarray(value)
+        # Generators and other one-shot iterables are materialized once
+        return np.asarray(value if isinstance(value, (list, tuple)) else list(value))
+
+    @classmethod
+    def _as_integer_array(cls, value):
+        array = cls._as_array(value)
+        if array.dtype.kind in 'iuO':
+            return array
+        if array.dtype.kind in 'fb' and np.all(np.mod(array, 1) == 0):
+            return array.astype(np.int64)
+        raise ValueError("GCD and LCM require integer values")
+
     def basic_operations(self, a, b, operation):
+        if is_batch(a) or is_batch(b):
+            if operation not in self._ARRAY_OPERATIONS:
+                raise ValueError("Unsupported operation")
+            ufunc = getattr(np, self._ARRAY_OPERATIONS[operation])
+            return ufunc(self._as_array(a), self._as_array(b))
         if operation == '+':
             return a + b
         elif operation == '-':
@@ -33,6 +808,8 @@ class Numerics:
             raise ValueError("Unsupported operation")
         
     def remainder(self, a, b):
+        if is_batch(a) or is_batch(b):
+            return np.mod(self._as_array(a), self._as_array(b))
         return a % b
         
     def convert_to_fraction(self, decimal_number):
@@ -42,9 +819,18 @@ class Numerics:
         return float(fraction)
     
     def least_common_multiple(self, a, b):
+        if is_batch(a) or is_batch(b):
+            return np.lcm(self._as_integer_array(a), self._as_integer_array(b))
+        # Plain integers skip sympy entirely
+        if isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral):
+            return math.lcm(int(a), int(b))
         return sp.lcm(a, b)
     
     def greatest_common_divisor(self, a, b):
+        if is_batch(a) or is_batch(b):
+            return np.gcd(self._as_integer_array(a), self._as_integer_array(b))
+        if isinstance(a, numbers.Integral) and isinstance(b, numbers.Integral):
+            return math.gcd(int(a), int(b))
         return sp.gcd(a, b)
 
 #-----------------------------------------------------
@@ -53,171 +839,1121 @@ class Numerics:
 class Algebra:
 
     def solve_quadratic(self, a, b, c):
+        if is_batch(a) or is_batch(b) or is_batch(c):
+            return self._solve_quadratic_arrays(a, b, c)
         d = (b ** 2) - (4 * a * c)
         root1 = (-b + sp.sqrt(d)) / (2 * a)
         root2 = (-b - sp.sqrt(d)) / (2 * a)
         return root1, root2
+
+    @staticmethod
+    def _solve_quadratic_arrays(a, b, c):
+        # Closed form over whole coefficient arrays (broadcast together). The root that would
+        # subtract nearly equal numbers is taken from c / q instead, which avoids cancellation.
+        a, b, c = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c)))
+        d = b * b - 4 * a * c
+        sqrt_d = np.sqrt(d.astype(complex))
+        positive_b = b >= 0
+        q = -0.5 * (b + np.where(positive_b, sqrt_d, -sqrt_d))
+        with np.errstate(all='ignore'):
+            from_a = q / a
+            from_c = np.divide(c, q, out=np.zeros_like(q), where=q != 0)
+        root1 = np.where(positive_b, from_c, from_a)
+        root2 = np.where(positive_b, from_a, from_c)
+        if np.all(d >= 0):
+            return root1.real, root2.real
+        return root1, root2
     
     def factor_polynomial(self, expr):
-        x = sp.symbols('x')
-        transformations = standard_transformations + (
-            implicit_multiplication_application,
-            convert_xor,
-        )
-        polynomial = parse_expr(expr, transformations=transformations, local_dict={'x': x})
-        polynomial = sp.nsimplify(polynomial)
-        return sp.factor(polynomial)
+        polynomial = parse_expression(expr, 'x', mode='implicit')
+        return cached_result('factor_polynomial', polynomial, (),
+                             lambda: sp.factor(sp.nsimplify(polynomial)))
     
     def expand_polynomial(self, expr):
-        x = sp.symbols('x')
-        transformations = standard_transformations + (
-            implicit_multiplication_application,
-            convert_xor,
-        )
-        polynomial = parse_expr(expr, transformations=transformations, local_dict={'x': x})
+        polynomial = parse_expression(expr, 'x', mode='implicit')
         return sp.expand(polynomial)
     
-    def zero_of_function(self, func, var):
+    def zero_of_function(self, func, var, timeout=None, method='symbolic', interval=(-10, 10),
+                         samples=2001, time_budget=2.0):
+        # method='symbolic' returns sympy's solutions; 'numeric' and 'auto' return an EvaluationResult
+        # whose value lists the real roots in interval
         variable = sp.symbols(var)
-        transformations = standard_transformations + (
-            implicit_multiplication_application,
-            convert_xor,
-        )
-        f = parse_expr(func, transformations=transformations, local_dict={var: variable})
-        return sp.solve(f, variable)
+        f = parse_expression(func, var, mode='implicit')
+        if method == 'symbolic':
+            return run_symbolic('solve', f, variable, timeout=timeout)
+        if method == 'auto':
+            # sympy's solve is only known to be complete for rational functions; for periodic or
+            # other transcendental equations it returns a partial list, so those go to the numeric path
+            if f.free_symbols <= {variable} and f.is_rational_function(variable):
+                try:
+                    solutions = run_symbolic('solve', f, variable, timeout=time_budget)
+                except (NotImplementedError, SymbolicTimeout, SymbolicWorkerError):
+                    solutions = None
+                if solutions is not None:
+                    return EvaluationResult(real_roots_in_interval(solutions, interval), 'symbolic', 0.0)
+        elif method != 'numeric':
+            raise ValueError(f"Unsupported root-finding method: {method}")
+        derivative = derivative_chain(f, var).derivative(1)
+        roots, error = find_real_roots(compile_function(f, var), compile_function(derivative, var),
+                                       float(interval[0]), float(interval[1]), samples)
+        return EvaluationResult(roots, 'numeric', error)
     
     def complete_square(self, a, b, c):
         h = -b / (2 * a)
         k = c - (b ** 2) / (4 * a)
         return a, h, k  # returns in the form a(x - h)^2 + k
 
+def real_roots_in_interval(solutions, interval):
+    # Sorted real values of exact solutions that lie in [a, b]; complex roots are dropped, but
+    # casus irreducibilis forms whose imaginary part is only rounding error are kept
+    roots = set()
+    for solution in solutions:
+        value = complex(sp.N(solution))
+        if abs(value.imag) <= 1e-12 * max(1.0, abs(value.real)) and interval[0] <= value.real <= interval[1]:
+            roots.add(value.real)
+    return sorted(roots)
+
+#-----------------------------------------------------
+# Incrementally grown derivative chains for the Calculus class
+#-----------------------------------------------------
+class DerivativeChain:
+    """Successive derivatives of one expression, computed only as far as anyone has asked for.
+
+    Taylor coefficients are memoized per expansion point, so asking for one more term
+    costs one differentiation and one substitution.
+    """
+
+    def __init__(self, expr, variable):
+        self.variable = variable
+        self._derivatives = [expr]
+        self._coefficients = {}
+        self._lock = threading.RLock()
+
+    def derivative(self, order):
+        with self._lock:
+            while len(self._derivatives) <= order:
+                self._derivatives.append(sp.diff(self._derivatives[-1], self.variable))
+            return self._derivatives[order]
+
+    def taylor_coefficients(self, point, count):
+        with self._lock:
+            coefficients = self._coefficients.setdefault(point, [])
+            while len(coefficients) < count:
+                k = len(coefficients)
+                coefficients.append(self.derivative(k).subs(self.variable, point) / sp.factorial(k))
+            return coefficients[:count]
+
+# Derivative chains keyed by (expression, variable name)
+derivative_cache = LRUCache(maxsize=256)
+
+def derivative_chain(expr, var):
+    return derivative_cache.get_or_create((expr, var), lambda: DerivativeChain(expr, sp.Symbol(var)))
+
 #-----------------------------------------------------
 # This class handles calculus operations
 #-----------------------------------------------------
 class Calculus:
 
-    def derrivative(self, func, var):
-        f = sp.sympify(func)
-        variable = sp.symbols(var)
-        return sp.diff(f, variable)
+    def derrivative(self, func, var, order=1):
+        f = parse_expression(func, var)
+        return derivative_chain(f, var).derivative(order)
     
-    def derrivative_at_point(self, func, var, point):
-        f = sp.sympify(func)
+    def derrivative_at_point(self, func, var, point, order=1):
+        # An array of points is evaluated through one compiled function instead of one subs() per point
+        f = parse_expression(func, var)
         variable = sp.symbols(var)
-        derivative = sp.diff(f, variable)
+        derivative = derivative_chain(f, var).derivative(order)
+        if is_batch(point):
+            return evaluate_compiled(compile_function(derivative, var), [np.asarray(point, dtype=float)])
         return derivative.subs(variable, point)
     
-    def integral(self, func, var):
-        f = sp.sympify(func)
+    def integral(self, func, var, timeout=None):
+        f = parse_expression(func, var)
         variable = sp.symbols(var)
-        return sp.integrate(f, variable)
+        return cached_result('integral', f, (var,),
+                             lambda: run_symbolic('integrate', f, variable, timeout=timeout))
     
-    def integral_definite(self, func, var, a, b):
-        f = sp.sympify(func)
+    def integral_definite(self, func, var, a, b, method='symbolic', tol=1e-10, time_budget=2.0, timeout=None):
+        # method='symbolic' returns the sympy value; 'numeric' and 'auto' return an EvaluationResult
+        f = parse_expression(func, var)
         variable = sp.symbols(var)
-        return sp.integrate(f, (variable, a, b))
+        if method == 'symbolic':
+            return run_symbolic('integrate', f, (variable, a, b), timeout=timeout)
+        if method == 'auto':
+            try:
+                exact = run_symbolic('integrate', f, (variable, a, b), timeout=time_budget)
+            except (SymbolicTimeout, SymbolicWorkerError):
+                exact = None
+            # A proven divergence (oo, -oo, zoo) is an answer too; only unevaluated integrals fall back
+            if (exact is not None and not exact.has(sp.Integral) and exact.is_number
+                    and (exact.is_finite or exact.is_infinite)):
+                return EvaluationResult(exact, 'symbolic', 0.0)
+        elif method != 'numeric':
+            raise ValueError(f"Unsupported integration method: {method}")
+        value, error = adaptive_quadrature(compile_function(f, var), float(a), float(b), tol)
+        return EvaluationResult(value, 'numeric', error)
     
-    def limit(self, func, var, point):
-        f = sp.sympify(func)
+    def limit(self, func, var, point, timeout=None):
+        f = parse_expression(func, var)
         variable = sp.symbols(var)
-        return sp.limit(f, variable, point)
+        return cached_result('limit', f, (var, point),
+                             lambda: run_symbolic('limit', f, variable, point, timeout=timeout))
     
-    def sum_of_series(self, series, var, n):
-        s = sp.sympify(series)
+    def sum_of_series(self, series, var, n, timeout=None, method='symbolic', time_budget=1.0,
+                      chunk_size=1_000_000):
+        # method='symbolic' returns the sympy value; 'numeric' and 'auto' return an EvaluationResult
+        s = parse_expression(series, var)
         variable = sp.symbols(var)
-        return sp.summation(s, (variable, 1, n))
+        if method == 'symbolic':
+            return run_symbolic('summation', s, (variable, 1, n), timeout=timeout)
+        if method == 'auto':
+            # Only accept a closed form that sympy finds within the time budget
+            try:
+                exact = run_symbolic('summation', s, (variable, 1, n), timeout=time_budget)
+            except (SymbolicTimeout, SymbolicWorkerError):
+                exact = None
+            if exact is not None and not exact.has(sp.Sum) and exact.is_number:
+                return EvaluationResult(exact, 'symbolic', 0.0)
+        elif method != 'numeric':
+            raise ValueError(f"Unsupported summation method: {method}")
+        value, error = 0.0, 0.0
+        for _, value, error in self.series_partial_sums(series, var, n, chunk_size):
+            pass
+        return EvaluationResult(value, 'numeric', error)
+
+    def series_partial_sums(self, series, var, n, chunk_size=1_000_000):
+        # Stream (last index, partial sum, error bound) after every chunk, e.g. for convergence checks
+        s = parse_expression(series, var)
+        return iter_partial_sums(compile_function(s, var), 1, int(n), chunk_size)
     
-    def taylor_series(self, func, var, point, n):
-        f = sp.sympify(func)
+    def taylor_series(self, func, var, point, n, timeout=None):
+        f = parse_expression(func, var)
         variable = sp.symbols(var)
-        return sp.series(f, variable, point, n).removeO()
+
+        def expand():
+            if timeout is None:
+                # Reuse cached derivatives; only non-analytic points need sympy's general series expansion
+                coefficients = derivative_chain(f, var).taylor_coefficients(point, n)
+                if not any(c.has(sp.zoo, sp.oo, -sp.oo, sp.nan) for c in coefficients):
+                    return sp.Add(*(c * (variable - point) ** k for k, c in enumerate(coefficients)))
+            return run_symbolic('series', f, variable, point, n, timeout=timeout).removeO()
+
+        return cached_result('taylor_series', f, (var, point, n), expand)
 
 #-----------------------------------------------------
-# This class handles probability calculations
+# One-pass, bounded-memory accumulator for large datasets
 #-----------------------------------------------------
-class StatisticalProbability:
+class StreamingStatistics:
+    """Summarize a numeric stream chunk by chunk without holding it in memory.
+
+    Mean and variance are exact (Chan's parallel update of Welford's algorithm).
+    The median comes from a fixed-size uniform reservoir sample and the mode from a
+    Misra-Gries heavy-hitter summary, so memory stays bounded however long the stream is.
+    """
+
+    def __init__(self, reservoir_size=100_000, heavy_hitters=1_000, seed=None):
+        self.reservoir_size = reservoir_size
+        self.heavy_hitters = heavy_hitters
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._reservoir = np.empty(reservoir_size, dtype=np.float64)
+        self._filled = 0
+        self._counters = {}
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_iterable(cls, iterable, chunk_size=65_536, **kwargs):
+        stats = cls(**kwargs)
+        iterator = iter(iterable)
+        while True:
+            chunk = np.fromiter(islice(iterator, chunk_size), dtype=np.float64)
+            if chunk.size == 0:
+                return stats
+            stats.update(chunk)
+
+    @classmethod
+    def from_text_file(cls, path, chunk_size=65_536, **kwargs):
+        # Whitespace-separated numbers, any number per line
+        with open(path) as handle:
+            values = (float(token) for line in handle for token in line.split())
+            return cls.from_iterable(values, chunk_size, **kwargs)
+
+    @classmethod
+    def from_binary_file(cls, path, dtype='float64', chunk_size=1_048_576, **kwargs):
+        # Raw binary arrays are memory-mapped; .npy files keep their own header and dtype
+        if str(path).endswith('.npy'):
+            data = np.load(path, mmap_mode='r')
+        else:
+            data = np.memmap(path, dtype=dtype, mode='r')
+        data = data.reshape(-1)
+        stats = cls(**kwargs)
+        for start in range(0, data.size, chunk_size):
+            stats.update(data[start:start + chunk_size])
+        return stats
+
+    def update(self, values):
+        chunk = np.asarray(values, dtype=np.float64).reshape(-1)
+        n = chunk.size
+        if n == 0:
+            return self
+
+        chunk_mean = float(chunk.mean())
+        chunk_m2 = float(np.dot(chunk - chunk_mean, chunk - chunk_mean))
+        total = self.count + n
+        delta = chunk_mean - self._mean
+        self._mean += delta * n / total
+        self._m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.minimum = min(self.minimum, float(chunk.min()))
+        self.maximum = max(self.maximum, float(chunk.max()))
+
+        self._update_reservoir(chunk)
+        self._update_counters(chunk)
+        self.count = total
+        return self
+
+    def _update_reservoir(self, chunk):
+        # Vectorized Algorithm R: item i (0-based, global) replaces a random slot with probability k / (i + 1)
+        seen = self.count
+        free = self.reservoir_size - self._filled
+        if free > 0:
+            take = min(free, chunk.size)
+            self._reservoir[self._filled:self._filled + take] = chunk[:take]
+            self._filled += take
+            chunk = chunk[take:]
+            seen += take
+        if chunk.size:
+            positions = np.arange(seen, seen + chunk.size, dtype=np.float64)
+            slots = (self._rng.random(chunk.size) * (positions + 1)).astype(np.int64)
+            keep = slots < self.reservoir_size
+            self._reservoir[slots[keep]] = chunk[keep]
+
+    def _update_counters(self, chunk):
+        k = self.heavy_hitters
+        values, counts = np.unique(chunk, return_counts=True)
+        # Reduce the chunk to k counters first so merging never touches more than 2k entries
+        if values.size > k:
+            cut = np.partition(counts, -(k + 1))[-(k + 1)]
+            keep = counts > cut
+            values, counts = values[keep], counts[keep] - cut
+        counters = self._counters
+        for value, count in zip(values.tolist(), counts.tolist()):
+            counters[value] = counters.get(value, 0) + count
+        if len(counters) > k:
+            cut = sorted(counters.values(), reverse=True)[k]
+            self._counters = {value: count - cut for value, count in counters.items() if count > cut}
+
+    @property
+    def mean(self):
+        return self._mean if self.count else math.nan
+
+    @property
+    def variance(self):
+        # Population variance, matching np.var
+        return self._m2 / self.count if self.count else math.nan
+
+    @property
+    def standard_deviation(self):
+        return math.sqrt(self.variance)
+
+    def quantile(self, q):
+        # Exact while the whole stream fits in the reservoir, approximate afterwards
+        if not self._filled:
+            return math.nan
+        return float(np.quantile(self._reservoir[:self._filled], q))
+
+    @property
+    def median(self):
+        return self.quantile(0.5)
+
+    @property
+    def mode(self):
+        # Smallest of the most frequent values, like np.unique + argmax
+        if not self._counters:
+            return math.nan
+        return min(self._counters.items(), key=lambda item: (-item[1], item[0]))[0]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'median': self.median,
+            'mode': self.mode,
+            'standard_deviation': self.standard_deviation,
+            'variance': self.variance,
+            'min': self.minimum if self.count else math.nan,
+            'max': self.maximum if self.count else math.nan,
+        }
+
+#-----------------------------------------------------
+# Exact integer combinatorics (math module kernels, optional mod p)
+#-----------------------------------------------------
+def _check_permutation_args(n, r):
+    if r > n or n < 0 or r < 0:
+        raise ValueError("Invalid values for permutations: require 0 <= r <= n")
+
+def factorial_mod(n, modulus):
+    # n! contains the factor `modulus` once n reaches it
+    if n < 0:
+        raise ValueError("factorial() not defined for negative values")
+    if n >= modulus:
+        return 0
+    result = 1
+    for k in range(2, n + 1):
+        result = result * k % modulus
+    return result
+
+def permutations_mod(n, r, modulus):
+    _check_permutation_args(n, r)
+    # Any run of `modulus` consecutive integers contains a multiple of it
+    if r >= modulus:
+        return 0
+    result = 1 % modulus
+    for k in range(n - r + 1, n + 1):
+        result = result * k % modulus
+    return result
+
+def combinations_mod(n, r, modulus):
+    """nCr mod a prime modulus, using Lucas' theorem once n reaches the modulus."""
+    if n < 0:
+        raise ValueError("combinations() require n >= 0")
+    if r < 0 or r > n:
+        return 0
+    result = 1 % modulus
+    while n or r:
+        n_digit, r_digit = n % modulus, r % modulus
+        if r_digit > n_digit:
+            return 0
+        r_digit = min(r_digit, n_digit - r_digit)
+        numerator = denominator = 1
+        for k in range(r_digit):
+            numerator = numerator * (n_digit - k) % modulus
+            denominator = denominator * (k + 1) % modulus
+        result = result * numerator * pow(denominator, -1, modulus) % modulus
+        n //= modulus
+        r //= modulus
+    return result
+
+class FactorialTable:
+    """Precomputed factorials and inverse factorials mod a prime for repeated nCr / nPr queries.
+
+    Queries accept scalars or NumPy arrays; arrays are answered with one vectorized lookup.
+    """
+
+    def __init__(self, limit, modulus):
+        if limit < 0:
+            raise ValueError("limit must be non-negative")
+        if limit >= modulus:
+            raise ValueError("limit must be smaller than the (prime) modulus")
+        self.limit = limit
+        self.modulus = modulus
+
+        fact = [1] * (limit + 1)
+        for k in range(1, limit + 1):
+            fact[k] = fact[k - 1] * k % modulus
+        inv_fact = [1] * (limit + 1)
+        inv_fact[limit] = pow(fact[limit], -1, modulus)
+        for k in range(limit, 0, -1):
+            inv_fact[k - 1] = inv_fact[k] * k % modulus
+
+        # Products of two residues fit in int64 only while modulus < 2**31
+        dtype = np.int64 if modulus < 2 ** 31 else object
+        self._fact = np.array(fact, dtype=dtype)
+        self._inv_fact = np.array(inv_fact, dtype=dtype)
+
+    def _indices(self, n):
+        n = np.asarray(n)
+        if n.dtype.kind not in 'iu':
+            raise ValueError("FactorialTable queries require integer arguments")
+        if n.size and (n.min() < 0 or n.max() > self.limit):
+            raise ValueError(f"n must be between 0 and {self.limit}")
+        return n
+
+    @staticmethod
+    def _result(values):
+        return int(values) if np.ndim(values) == 0 else values
 
     def factorial(self, n):
-        return sp.factorial(n)
-    
+        return self._result(self._fact[self._indices(n)])
+
     def permutations(self, n, r):
-        # Number of permutations (nPr): n! / (n - r)!
-        if r > n or n < 0 or r < 0:
+        n, r = np.broadcast_arrays(self._indices(n), np.asarray(r))
+        if np.any((r < 0) | (r > n)):
             raise ValueError("Invalid values for permutations: require 0 <= r <= n")
-        return sp.factorial(n) / sp.factorial(n - r)
-    
+        return self._result(self._fact[n] * self._inv_fact[n - r] % self.modulus)
+
     def combinations(self, n, r):
-        return sp.binomial(n, r)
+        n, r = np.broadcast_arrays(self._indices(n), np.asarray(r))
+        valid = (r >= 0) & (r <= n)
+        r_safe = np.where(valid, r, 0)
+        values = self._fact[n] * self._inv_fact[r_safe] % self.modulus * self._inv_fact[n - r_safe] % self.modulus
+        return self._result(np.where(valid, values, 0))
+
+#-----------------------------------------------------
+# This class handles probability calculations
+#-----------------------------------------------------
+class StatisticalProbability:
+
+    def factorial(self, n, modulus=None):
+        if modulus is not None:
+            return factorial_mod(n, modulus)
+        return math.factorial(n)
     
+    def permutations(self, n, r, modulus=None):
+        # Number of permutations (nPr): n! / (n - r)!, computed without building either factorial
+        _check_permutation_args(n, r)
+        if modulus is not None:
+            return permutations_mod(n, r, modulus)
+        return math.perm(n, r)
+    
+    def combinations(self, n, r, modulus=None):
+        # modulus must be prime
+        if modulus is not None:
+            return combinations_mod(n, r, modulus)
+        if n < 0:
+            raise ValueError("combinations() require n >= 0")
+        if r < 0:
+            return 0
+        return math.comb(n, r)
+
+    def factorial_table(self, limit, modulus):
+        return FactorialTable(limit, modulus)
+
+    def summarize(self, source, chunk_size=65_536, binary=False, dtype='float64'):
+        # Stream a file path (text, or binary when binary=True / .npy) or any iterable in one pass
+        if isinstance(source, str):
+            if binary or source.endswith('.npy'):
+                stats = StreamingStatistics.from_binary_file(source, dtype=dtype, chunk_size=chunk_size)
+            else:
+                stats = StreamingStatistics.from_text_file(source, chunk_size=chunk_size)
+        else:
+            stats = StreamingStatistics.from_iterable(source, chunk_size=chunk_size)
+        return stats.summary()
+
+    # Iterators (generators, file readers, ...) are consumed in one streaming pass
+    # instead of being materialized as a list
+
     def mean(self, data):
+        if isinstance(data, Iterator):
+            return StreamingStatistics.from_iterable(data).mean
         return np.mean(data)
     
     def median(self, data):
+        if isinstance(data, Iterator):
+            return StreamingStatistics.from_iterable(data).median
         return np.median(data)
     
     def mode(self, data):
+        if isinstance(data, Iterator):
+            return StreamingStatistics.from_iterable(data).mode
         values, counts = np.unique(data, return_counts=True)
         max_count_index = np.argmax(counts)
         return values[max_count_index]
     
     def standard_deviation(self, data):
+        if isinstance(data, Iterator):
+            return StreamingStatistics.from_iterable(data).standard_deviation
         return np.std(data)
     
     def variance(self, data):
+        if isinstance(data, Iterator):
+            return StreamingStatistics.from_iterable(data).variance
         return np.var(data)
 
+#-----------------------------------------------------
+# Sampling and decimation helpers for the Plotting class
+#-----------------------------------------------------
+def robust_range(y):
+    # The 5-95 percentile band of the finite values, widened by its own width on both sides;
+    # values near poles fall far outside it
+    finite = y[np.isfinite(y)]
+    if not finite.size:
+        return -1.0, 1.0
+    low, high = np.percentile(finite, [5, 95])
+    scale = max(high - low, 1e-12)
+    return float(low - scale), float(high + scale)
+
+def adaptive_sample(f, a, b, initial_points=200, max_points=20_000, tolerance=1e-3, max_depth=12):
+    """Sample the vectorized function f on [a, b], refining only where a straight line is a poor fit.
+
+    Each round evaluates every interval midpoint in one call and bisects the intervals whose midpoint
+    deviates from the chord by more than tolerance * (robust y-range), or where f stops being finite.
+    Intervals lying wholly outside the robust range of the initial samples (towards a pole) are not
+    refined. Jumps that survive max_depth bisections, and off-range intervals whose sign flips, are
+    treated as discontinuities and broken with a NaN. Returns (x, y).
+    """
+    x = np.linspace(a, b, initial_points)
+    y = evaluate_compiled(f, [x]).real
+    min_width = (b - a) / (initial_points - 1) / 2 ** max_depth
+    view_low, view_high = robust_range(y)
+
+    def off_range(y):
+        # Intervals with both ends beyond the robust range; refining them only chases a pole
+        with np.errstate(invalid='ignore'):
+            far = (y < view_low) | (y > view_high)
+        return far[:-1] & far[1:]
+
+    def midpoint_deviation(x, y):
+        xm = (x[:-1] + x[1:]) / 2
+        ym = evaluate_compiled(f, [xm]).real
+        finite = np.isfinite(y)
+        if finite.any():
+            low, high = np.percentile(y[finite], [5, 95])
+            scale = max(high - low, 1e-12)
+        else:
+            scale = 1.0
+        with np.errstate(invalid='ignore'):
+            deviation = np.abs(ym - (y[:-1] + y[1:]) / 2) / scale
+        # Intervals where f becomes (or stops being) finite always need a closer look
+        deviation[np.isfinite(ym) != (finite[:-1] & finite[1:])] = np.inf
+        deviation[np.isnan(deviation) & ~(np.isnan(ym) & np.isnan(y[:-1]) & np.isnan(y[1:]))] = np.inf
+        return xm, ym, np.nan_to_num(deviation, nan=0.0)
+
+    for _ in range(max_depth):
+        budget = max_points - x.size
+        if budget <= 0:
+            break
+        xm, ym, deviation = midpoint_deviation(x, y)
+        refine = (deviation > tolerance) & (np.diff(x) > 2 * min_width) & ~off_range(y)
+        if not refine.any():
+            break
+        index = np.flatnonzero(refine)
+        if index.size > budget:
+            # Spend the remaining budget on the worst intervals
+            index = np.sort(index[np.argsort(deviation[index])[-budget:]])
+        x = np.insert(x, index + 1, xm[index])
+        y = np.insert(y, index + 1, ym[index])
+
+    # A step that still deviates at the finest width is a jump if it dwarfs both neighbouring steps
+    # (a continuous function's steps shrink together) or a pole if the sign flips across it;
+    # don't draw a line across either
+    _, _, deviation = midpoint_deviation(x, y)
+    step = np.abs(np.diff(y))
+    neighbours = np.maximum(np.concatenate([[0.0], step[:-1]]), np.concatenate([step[1:], [0.0]]))
+    with np.errstate(invalid='ignore'):
+        broken = (step > 2 * neighbours) | (y[:-1] * y[1:] < 0)
+        crosses_pole = off_range(y) & (y[:-1] * y[1:] < 0)
+    jumps = np.flatnonzero(((deviation > tolerance) & (np.diff(x) <= 2 * min_width) & broken) | crosses_pole)
+    if jumps.size:
+        x = np.insert(x, jumps + 1, (x[jumps] + x[jumps + 1]) / 2)
+        y = np.insert(y, jumps + 1, np.nan)
+    return x, y
+
+def decimate_minmax(x, y, bins):
+    """Reduce (x, y) with x sorted to at most 2 * bins points that keep each bin's min and max."""
+    x, y = np.asarray(x), np.asarray(y)
+    starts = np.unique(np.linspace(0, x.size, bins, endpoint=False).astype(np.int64))
+    low = np.fmin.reduceat(y, starts)
+    high = np.fmax.reduceat(y, starts)
+    return np.repeat(x[starts], 2), np.column_stack([low, high]).ravel()
+
+#-----------------------------------------------------
+# Headless rendering of plots to image files
+#-----------------------------------------------------
+# One off-screen figure per thread, cleared and redrawn for every file instead of being rebuilt
+_render_figures = threading.local()
+
+def render_figure():
+    """Return this thread's reusable off-screen figure, cleared and ready to draw on."""
+    figure = getattr(_render_figures, 'figure', None)
+    if figure is None:
+        # A bare Figure never touches pyplot or a GUI backend
+        figure = _render_figures.figure = mpl_figure.Figure()
+    else:
+        figure.clear()
+    return figure
+
+def save_figure(figure, path, dpi=100):
+    # The file format (png, svg, pdf, ...) follows the extension of path
+    figure.savefig(path, dpi=dpi)
+    return path
+
+def show_figure():
+    # On screen, rendering happens when the figure is shown
+    plt.show()
+
+PLOT_METHODS = ('plot_function', 'plot_data', 'three__plot')
+
+def _init_render_worker():
+    # Render processes only draw off-screen; they never need a window or a sympy worker
+    os.environ['MPLBACKEND'] = 'Agg'
+
+def _render_job(job):
+    # job: {"method", "args", "kwargs", "path", "dpi"}; returns a batch-style response dict
+    response = {'path': job.get('path') if isinstance(job, dict) else None}
+    try:
+        if not isinstance(job, dict) or not job.get('path'):
+            raise ValueError("Plot job must be an object with a path")
+        method = job.get('method')
+        if method not in PLOT_METHODS:
+            raise ValueError(f"Unknown plot method: {method}")
+        getattr(Plotting(), method)(*job.get('args', []), path=job['path'], dpi=job.get('dpi', 100),
+                                    **job.get('kwargs', {}))
+    except Exception as exc:
+        response['error'] = f"{type(exc).__name__}: {exc}"
+    return response
+
+def render_plots(jobs, workers=None, chunksize=8):
+    """Render plot jobs to image files across worker processes and return one response per job, in order.
+
+    Each job is a dict {"method": "plot_function" | "plot_data" | "three__plot", "args": [...],
+    "kwargs": {...}, "path": "out.png", "dpi": 100}. Workers never open a window, and each one
+    reuses a single figure for all of its jobs. Failed jobs get an 'error' entry instead of raising.
+    """
+    jobs = list(jobs)
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+    if workers == 1:
+        return [_render_job(job) for job in jobs]
+    context = multiprocessing.get_context('spawn')
+    with futures.ProcessPoolExecutor(workers, mp_context=context, initializer=_init_render_worker) as pool:
+        return list(pool.map(_render_job, jobs, chunksize=chunksize))
+
 #-----------------------------------------------------
 # This class handles plotting functions
 #-----------------------------------------------------
+# three__plot draws at most this many grid points along each axis
+SURFACE_MAX_POINTS = 200
+
 class Plotting:
 
-    def plot_function(self, func, var, x_range):
-        f = sp.sympify(func)
-        variable = sp.symbols(var)
-        x_vals = np.linspace(x_range[0], x_range[1], 400)
-        f_lambdified = sp.lambdify(variable, f, modules=['numpy'])
-        y_vals = f_lambdified(x_vals)
-
-        plt.plot(x_vals, y_vals)
-        plt.title(f'Plot of {func}')
-        plt.xlabel(var)
-        plt.ylabel('f({})'.format(var))
-        plt.grid(True)
-        plt.show()
+    # With path=None plots open in a window as before; with a path they are drawn off-screen and saved
+    def _figure(self, path):
+        return plt.figure() if path is None else render_figure()
+
+    def _finish(self, figure, path, dpi):
+        if path is None:
+            show_figure()
+            # show() has returned: the window was closed, or (e.g. under Agg) there never was one.
+            # Only pyplot's interactive mode keeps figures open on purpose.
+            if not plt.isinteractive():
+                plt.close(figure)
+            return None
+        return save_figure(figure, path, dpi)
+
+    def evaluate(self, func, vars, arrays):
+        # Evaluate func over NumPy arrays without drawing; vars and arrays are matched by position
+        if isinstance(vars, str):
+            vars = (vars,)
+        vars = tuple(vars)
+        if len(vars) != len(arrays):
+            raise ValueError("Expected one array per variable")
+        f = parse_expression(func, vars)
+        arrays = [np.asarray(a, dtype=float) for a in arrays]
+        return evaluate_compiled(compile_function(f, vars), arrays)
+
+    def plot_function(self, func, var, x_range, points=400, adaptive=True, max_points=20_000, path=None, dpi=100):
+        # Adaptive sampling starts from `points` and adds more only near curvature and discontinuities
+        y_limits = None
+        if adaptive:
+            compiled = compile_function(parse_expression(func, var), var)
+            x_vals, y_vals = adaptive_sample(compiled, float(x_range[0]), float(x_range[1]),
+                                             initial_points=points, max_points=max_points)
+            if np.isnan(y_vals).any():
+                # Around poles, fit the view to the robust range of an even sample, not to the huge
+                # values next to the pole
+                even = np.linspace(x_range[0], x_range[1], points)
+                low, high = robust_range(evaluate_compiled(compiled, [even]).real)
+                finite = y_vals[np.isfinite(y_vals)]
+                if finite.size and (finite.min() < low or finite.max() > high):
+                    y_limits = (max(low, finite.min()), min(high, finite.max()))
+        else:
+            x_vals = np.linspace(x_range[0], x_range[1], points)
+            y_vals = self.evaluate(func, var, [x_vals])
+
+        fig = self._figure(path)
+        ax = fig.add_subplot(111)
+        ax.plot(x_vals, y_vals)
+        if y_limits is not None:
+            ax.set_ylim(*y_limits)
+        ax.set_title(f'Plot of {func}')
+        ax.set_xlabel(var)
+        ax.set_ylabel('f({})'.format(var))
+        ax.grid(True)
+        return self._finish(fig, path, dpi)
     
-    def plot_data(self, data_x, data_y, title='Data Plot', x_label='X-axis', y_label='Y-axis'):
-        plt.scatter(data_x, data_y)
-        plt.title(title)
-        plt.xlabel(x_label)
-        plt.ylabel(y_label)
-        plt.grid(True)
-        plt.show()
+    def plot_data(self, data_x, data_y, title='Data Plot', x_label='X-axis', y_label='Y-axis', max_points=50_000,
+                  path=None, dpi=100):
+        # Large inputs are reduced first so render time does not grow with the number of points
+        data_x, data_y = np.asarray(data_x), np.asarray(data_y)
+        fig = self._figure(path)
+        ax = fig.add_subplot(111)
+        if data_x.size <= max_points:
+            ax.scatter(data_x, data_y)
+        elif np.all(data_x[1:] >= data_x[:-1]):
+            # Ordered data (e.g. a time series): keep each bin's min/max envelope
+            ax.scatter(*decimate_minmax(data_x, data_y, max_points // 2), s=4)
+        else:
+            # Unordered point clouds: draw a binned density image instead of every point
+            counts, x_edges, y_edges = np.histogram2d(data_x, data_y, bins=512)
+            counts = np.ma.masked_equal(counts, 0)
+            mesh = ax.pcolormesh(x_edges, y_edges, counts.T, cmap='viridis')
+            fig.colorbar(mesh, ax=ax, label='Points per bin')
+        ax.set_title(title)
+        ax.set_xlabel(x_label)
+        ax.set_ylabel(y_label)
+        ax.grid(True)
+        return self._finish(fig, path, dpi)
     
-    def three__plot(self, func, var1, var2, x_range, y_range):
-        f = sp.sympify(func)
-        variable1 = sp.symbols(var1)
-        variable2 = sp.symbols(var2)
-        
-        x_vals = np.linspace(x_range[0], x_range[1], 100)
-        y_vals = np.linspace(y_range[0], y_range[1], 100)
-        X, Y = np.meshgrid(x_vals, y_vals)
-        f_lambdified = sp.lambdify((variable1, variable2), f, modules=['numpy'])
-        Z = f_lambdified(X, Y)
+    def surface_values(self, func, var1, var2, x_range, y_range, resolution=100, dtype='float64',
+                       memory_budget=64 * 1024 ** 2):
+        # Evaluate func on a resolution grid (int or (nx, ny)) without drawing; returns (x, y, Z)
+        nx, ny = (resolution, resolution) if isinstance(resolution, int) else resolution
+        dtype = np.dtype(dtype)
+        x_vals = np.linspace(x_range[0], x_range[1], nx, dtype=dtype)
+        y_vals = np.linspace(y_range[0], y_range[1], ny, dtype=dtype)
+        compiled = compile_function(parse_expression(func, (var1, var2)), (var1, var2))
 
-        fig = plt.figure()
+        # Z is allocated once and filled a band of rows at a time; X/Y are never materialized.
+        # Allow for several full-band temporaries inside the compiled expression.
+        Z = np.empty((ny, nx), dtype=dtype)
+        rows = max(1, memory_budget // (nx * dtype.itemsize * 8))
+        for start in range(0, ny, rows):
+            stop = min(ny, start + rows)
+            Z[start:stop] = np.real(evaluate_compiled(compiled, [x_vals[None, :], y_vals[start:stop, None]]))
+        return x_vals, y_vals, Z
+
+    def three__plot(self, func, var1, var2, x_range, y_range, resolution=100, dtype='float64',
+                    memory_budget=64 * 1024 ** 2, path=None, dpi=100):
+        x_vals, y_vals, Z = self.surface_values(func, var1, var2, x_range, y_range,
+                                                resolution, dtype, memory_budget)
+        # plot_surface makes full-size float64 copies of its inputs, so hand it an even
+        # sample of at most SURFACE_MAX_POINTS per axis (edges included) rather than the full grid
+        rows = np.unique(np.linspace(0, Z.shape[0] - 1, SURFACE_MAX_POINTS).astype(np.intp))
+        cols = np.unique(np.linspace(0, Z.shape[1] - 1, SURFACE_MAX_POINTS).astype(np.intp))
+        Z = Z[np.ix_(rows, cols)]
+        X = np.broadcast_to(x_vals[cols][None, :], Z.shape)
+        Y = np.broadcast_to(y_vals[rows][:, None], Z.shape)
+
+        fig = self._figure(path)
         ax = fig.add_subplot(111, projection='3d')
-        ax.plot_surface(X, Y, Z, cmap='viridis')
+        ax.plot_surface(X, Y, Z, cmap='viridis', rcount=Z.shape[0], ccount=Z.shape[1])
         ax.set_title(f'3D Plot of {func}')
         ax.set_xlabel(var1)
         ax.set_ylabel(var2)
         ax.set_zlabel('f({}, {})'.format(var1, var2))
-        plt.show()
+        return self._finish(fig, path, dpi)
+
+#-----------------------------------------------------
+# Opt-in per-operation metrics and profiling
+#-----------------------------------------------------
+# Classes whose public methods are instrumented by metrics.enable()
+INSTRUMENTED_CLASSES = (Numerics, Algebra, Calculus, StatisticalProbability, Plotting)
+
+# Latency histogram bucket upper bounds in seconds: 10 us, 40 us, ... ~168 s (plus an overflow bucket)
+LATENCY_BUCKETS = tuple(1e-5 * 4 ** k for k in range(13))
+
+class Metrics:
+    """Call counts, latency histograms and parse/compute/compile/render breakdowns per public method.
+
+    Nothing is wrapped until enable() is called, and disable() restores the original functions,
+    so a disabled Metrics costs nothing. With profile_threshold set, each call runs under cProfile
+    and the statistics of calls slower than the threshold are kept.
+    """
+
+    # Module-level helpers timed as phases; whatever is left of a call counts as 'compute'
+    PHASE_FUNCTIONS = {'parse_expression': 'parse', 'compile_function': 'compile', 'save_figure': 'render',
+                       'show_figure': 'render'}
+
+    def __init__(self):
+        self.enabled = False
+        self.profile_threshold = None
+        self.profile_limit = 20
+        self._operations = {}
+        self._originals = []
+        self._lock = threading.Lock()
+        self._profiler_lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, profile_threshold=None, profile_limit=20):
+        with self._lock:
+            self.profile_threshold = profile_threshold
+            self.profile_limit = profile_limit
+            if self.enabled:
+                return
+            module = globals()
+            for cls in INSTRUMENTED_CLASSES:
+                for name, attribute in list(vars(cls).items()):
+                    if name.startswith('_') or not callable(attribute) or isinstance(attribute, type):
+                        continue
+                    self._originals.append((cls, name, attribute))
+                    setattr(cls, name, self._wrap_operation(f"{cls.__name__}.{name}", attribute))
+            for name, phase in self.PHASE_FUNCTIONS.items():
+                self._originals.append((module, name, module[name]))
+                module[name] = self._wrap_phase(phase, module[name])
+            self.enabled = True
+
+    def disable(self):
+        with self._lock:
+            for owner, name, original in reversed(self._originals):
+                if isinstance(owner, dict):
+                    owner[name] = original
+                else:
+                    setattr(owner, name, original)
+            self._originals.clear()
+            self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+
+    def _active_calls(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _wrap_phase(self, phase, function):
+        def timed(*args, **kwargs):
+            stack = self._active_calls()
+            if not stack:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                for phases in stack:
+                    phases[phase] = phases.get(phase, 0.0) + elapsed
+        timed.__wrapped__ = function
+        return timed
+
+    def _wrap_operation(self, key, function):
+        def instrumented(*args, **kwargs):
+            stack = self._active_calls()
+            phases = {}
+            stack.append(phases)
+            # cProfile allows one active profiler, so nested or concurrent calls go unprofiled
+            profiler = None
+            if self.profile_threshold is not None and self._profiler_lock.acquire(blocking=False):
+                profiler = cProfile.Profile()
+                profiler.enable()
+            failed = False
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                if profiler is not None:
+                    profiler.disable()
+                    self._profiler_lock.release()
+                stack.pop()
+                self._record(key, elapsed, phases, failed, profiler)
+        instrumented.__wrapped__ = function
+        instrumented.__name__ = function.__name__
+        instrumented.__doc__ = function.__doc__
+        return instrumented
+
+    def _record(self, key, elapsed, phases, failed, profiler):
+        phases['compute'] = max(0.0, elapsed - sum(phases.values()))
+        profile = None
+        if profiler is not None and elapsed >= self.profile_threshold:
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(25)
+            profile = {'seconds': elapsed, 'stats': output.getvalue()}
+
+        with self._lock:
+            entry = self._operations.get(key)
+            if entry is None:
+                entry = self._operations[key] = {
+                    'count': 0, 'errors': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+                    'histogram': [0] * (len(LATENCY_BUCKETS) + 1),
+                    'phases': {}, 'slow_profiles': [],
+                }
+            entry['count'] += 1
+            entry['errors'] += failed
+            entry['total_seconds'] += elapsed
+            entry['max_seconds'] = max(entry['max_seconds'], elapsed)
+            bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if elapsed <= bound), len(LATENCY_BUCKETS))
+            entry['histogram'][bucket] += 1
+            for phase, seconds in phases.items():
+                entry['phases'][phase] = entry['phases'].get(phase, 0.0) + seconds
+            if profile is not None:
+                entry['slow_profiles'].append(profile)
+                del entry['slow_profiles'][:-self.profile_limit]
+
+    def snapshot(self):
+        labels = [f"<={bound:g}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]:g}s"]
+        with self._lock:
+            operations = {}
+            for key, entry in sorted(self._operations.items()):
+                operations[key] = {
+                    'count': entry['count'],
+                    'errors': entry['errors'],
+                    'total_seconds': entry['total_seconds'],
+                    'mean_seconds': entry['total_seconds'] / entry['count'],
+                    'max_seconds': entry['max_seconds'],
+                    'histogram': {label: n for label, n in zip(labels, entry['histogram']) if n},
+                    'phases': dict(entry['phases']),
+                    'slow_profiles': list(entry['slow_profiles']),
+                }
+        return {'enabled': self.enabled, 'timestamp': time.time(), 'operations': operations}
+
+    def export_json(self, path):
+        with open(path, 'w') as handle:
+            json.dump(self.snapshot(), handle, indent=2)
+
+metrics = Metrics()
+
+#-----------------------------------------------------
+# Non-interactive batch mode: JSON-lines requests in, JSON-lines results out
+#-----------------------------------------------------
+# Category names accepted in batch requests
+BATCH_CATEGORIES = {
+    'numerics': Numerics,
+    'algebra': Algebra,
+    'calculus': Calculus,
+    'statistical_probability': StatisticalProbability,
+    'plotting': Plotting,
+}
+
+def _to_json(value):
+    # Convert calculator results (sympy, NumPy, tuples, ...) into JSON-serializable values
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, EvaluationResult):
+        return {name: _to_json(item) for name, item in value._asdict().items()}
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if type(value).__module__ == 'numpy':
+        return _to_json(value.tolist())
+    return str(value)
+
+def execute_request(request):
+    """Run one batch request {"category", "operation", "args", "kwargs", "id"} and return its response dict."""
+    response = {'id': request.get('id')} if isinstance(request, dict) else {'id': None}
+    try:
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        category = BATCH_CATEGORIES.get(str(request.get('category', '')).lower())
+        operation = request.get('operation', '')
+        if category is None:
+            raise ValueError(f"Unknown category: {request.get('category')}")
+        if not isinstance(operation, str) or operation.startswith('_') or not hasattr(category, operation):
+            raise ValueError(f"Unknown operation: {operation}")
+        if category is Plotting and operation in PLOT_METHODS and not request.get('kwargs', {}).get('path'):
+            raise ValueError("Plot requests in batch mode need a 'path' in kwargs to save the image to")
+        function = getattr(category(), operation)
+        kwargs = dict(request.get('kwargs', {}))
+        # Results are written in input order, so one runaway symbolic call must not stall the stream
+        if 'timeout' in inspect.signature(function).parameters:
+            kwargs.setdefault('timeout', CLI_TIMEOUT)
+        result = function(*request.get('args', []), **kwargs)
+        response['result'] = _to_json(result)
+    except Exception as exc:
+        response['error'] = f"{type(exc).__name__}: {exc}"
+    return response
+
+def _init_batch_worker(cache_path=None):
+    # Plot requests in batch mode must never open a window
+    os.environ['MPLBACKEND'] = 'Agg'
+    # Batch processes already run in parallel; each needs only one sympy worker for timeouts,
+    # started by the first request that actually runs a symbolic operation
+    configure_symbolic_executor(workers=1, timeout=CLI_TIMEOUT, memory_limit=CLI_MEMORY_LIMIT, start=False)
+    if cache_path:
+        enable_persistent_cache(cache_path)
+
+def _parse_request_line(line_number, line):
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as exc:
+        return None, {'id': None, 'line': line_number, 'error': f"JSONDecodeError: {exc}"}
+    if isinstance(request, dict):
+        request.setdefault('id', line_number)
+    return request, None
+
+def run_batch(input_stream, output_stream, workers=None, cache_path=None):
+    """Read JSON-lines requests, run them across worker processes and stream the results out in input order.
+
+    At most a few requests per worker are in flight, so memory stays flat for arbitrarily long inputs.
+    With cache_path, every worker shares one persistent cache of symbolic results.
+    Returns a summary with the request count, failures, elapsed time and throughput.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    processed = failed = 0
+
+    def emit(response):
+        nonlocal processed, failed
+        processed += 1
+        failed += 'error' in response
+        output_stream.write(json.dumps(response) + '\n')
+
+    lines = ((number, line) for number, line in enumerate(input_stream, 1) if line.strip())
+    if workers == 1:
+        _init_batch_worker(cache_path)
+        for number, line in lines:
+            request, error = _parse_request_line(number, line)
+            emit(error or execute_request(request))
+    else:
+        context = multiprocessing.get_context('spawn')
+        with futures.ProcessPoolExecutor(workers, mp_context=context, initializer=_init_batch_worker,
+                                         initargs=(cache_path,)) as pool:
+            pending = deque()
+            for number, line in lines:
+                request, error = _parse_request_line(number, line)
+                pending.append(error if error else pool.submit(execute_request, request))
+                while len(pending) >= workers * 4:
+                    head = pending.popleft()
+                    emit(head if isinstance(head, dict) else head.result())
+            while pending:
+                head = pending.popleft()
+                emit(head if isinstance(head, dict) else head.result())
+    output_stream.flush()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': processed,
+        'failed': failed,
+        'seconds': elapsed,
+        'requests_per_second': processed / elapsed if elapsed > 0 else 0.0,
+    }
+
+def batch_main(argv=None):
+    parser = argparse.ArgumentParser(description="Run calculator requests from a JSON-lines file or stdin.")
+    parser.add_argument('--batch', metavar='PATH', default='-',
+                        help="JSON-lines request file ('-' for stdin)")
+    parser.add_argument('--output', metavar='PATH', default='-',
+                        help="where to write JSON-lines results ('-' for stdout)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument('--cache', metavar='PATH',
+                        help="SQLite file that keeps symbolic results between runs")
+    args = parser.parse_args(argv)
+
+    input_stream = sys.stdin if args.batch == '-' else open(args.batch)
+    output_stream = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        summary = run_batch(input_stream, output_stream, args.workers, args.cache)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    print(f"Processed {summary['requests']} requests ({summary['failed']} failed) in "
+          f"{summary['seconds']:.2f} s: {summary['requests_per_second']:.1f} requests/s", file=sys.stderr)
+    return 1 if summary['failed'] else 0
 
 #-----------------------------------------------------
 # Main program to interact with the user
 #-----------------------------------------------------
-while True:
-    if __name__ == "__main__":
+# Symbolic operations in the menu run in a worker process so one bad expression cannot hang the loop
+CLI_TIMEOUT = 30.0
+CLI_MEMORY_LIMIT = 2 * 1024 ** 3
+
+if __name__ == "__main__":
+    # Any command-line arguments switch to non-interactive batch mode
+    if len(sys.argv) > 1:
+        sys.exit(batch_main(sys.argv[1:]))
+    # Start the worker now so sympy is already imported by the first request
+    configure_symbolic_executor(workers=1, timeout=CLI_TIMEOUT, memory_limit=CLI_MEMORY_LIMIT)
+    while True:
         print()
         print("---- Welcome to the Advanced Python Calculator ----")
         print("Choose an category:")
@@ -322,8 +2058,11 @@ while True:
             # Find Zeros of Function
             elif operation == 'd':
                 func = input("Enter function (in terms of x): ")
-                zeros = algebra.zero_of_function(func, 'x')
-                print(f"---Zeros of the function: {zeros}---")
+                try:
+                    zeros = algebra.zero_of_function(func, 'x', timeout=CLI_TIMEOUT)
+                    print(f"---Zeros of the function: {zeros}---")
+                except (SymbolicTimeout, SymbolicWorkerError) as exc:
+                    print(f"---{exc}---")
             # Complete the Square
             elif operation == 'e':
                 a = float(input("Enter coefficient a: "))
@@ -368,34 +2107,47 @@ while True:
             # Integral
             elif operation == 'c':
                 func = input("Enter function (in terms of x): ")
-                integral = calculus.integral(func, 'x')
-                print(f"---Indefinite Integral: {integral} + C---")
+                try:
+                    integral = calculus.integral(func, 'x', timeout=CLI_TIMEOUT)
+                    print(f"---Indefinite Integral: {integral} + C---")
+                except (SymbolicTimeout, SymbolicWorkerError) as exc:
+                    print(f"---{exc}---")
             # Definite Integral
             elif operation == 'd':
                 func = input("Enter function (in terms of x): ")
                 a = float(input("Enter lower limit a: "))
                 b = float(input("Enter upper limit b: "))
-                definite_integral = calculus.integral_definite(func, 'x', a, b)
-                print(f"---Definite Integral from {a} to {b}: {definite_integral}---")
+                definite_integral = calculus.integral_definite(func, 'x', a, b, method='auto')
+                print(f"---Definite Integral from {a} to {b}: {definite_integral.value} "
+                      f"({definite_integral.method}, error estimate {definite_integral.error_estimate:.2e})---")
             # Limit
             elif operation == 'e':
                 func = input("Enter function (in terms of x): ")
                 point = float(input("Enter point to evaluate limit: "))
-                limit_value = calculus.limit(func, 'x', point)
-                print(f"---Limit as x approaches {point}: {limit_value}---")
+                try:
+                    limit_value = calculus.limit(func, 'x', point, timeout=CLI_TIMEOUT)
+                    print(f"---Limit as x approaches {point}: {limit_value}---")
+                except (SymbolicTimeout, SymbolicWorkerError) as exc:
+                    print(f"---{exc}---")
             # Sum of Series
             elif operation == 'f':
                 series = input("Enter series expression (in terms of n): ")
                 n = int(input("Enter upper limit n: "))
-                sum_series = calculus.sum_of_series(series, 'n', n)
-                print(f"---Sum of Series up to n={n}: {sum_series}---")
+                try:
+                    sum_series = calculus.sum_of_series(series, 'n', n, timeout=CLI_TIMEOUT)
+                    print(f"---Sum of Series up to n={n}: {sum_series}---")
+                except (SymbolicTimeout, SymbolicWorkerError) as exc:
+                    print(f"---{exc}---")
             # Taylor Series
             elif operation == 'g':
                 func = input("Enter function (in terms of x): ")
                 point = float(input("Enter point to expand around:"))
                 n = int(input("Enter number of terms n: "))
-                taylor_series = calculus.taylor_series(func, 'x', point, n)
-                print(f"---Taylor Series: {taylor_series}---")
+                try:
+                    taylor_series = calculus.taylor_series(func, 'x', point, n, timeout=CLI_TIMEOUT)
+                    print(f"---Taylor Series: {taylor_series}---")
+                except (SymbolicTimeout, SymbolicWorkerError) as exc:
+                    print(f"---{exc}---")
 
             elif operation == 'q':
                 continue
@@ -417,9 +2169,10 @@ while True:
             print("f. Mode")
             print("g. Standard Deviation")
             print("h. Variance")
+            print("i. Summarize Data File")
             print("q. Go back to main menu")
             
-            operation = input("Enter operation (a-h): ")
+            operation = input("Enter operation (a-i): ")
             # Factorial
             if operation == 'a':
                 n = int(input("Enter number to compute factorial: "))
@@ -462,6 +2215,13 @@ while True:
                 data = list(map(float, input("Enter data points separated by spaces: ").split()))
                 result = stats.variance(data)
                 print(f"---Variance: {result}---")
+            # Summarize Data File (streamed, so the file can be larger than memory)
+            elif operation == 'i':
+                path = input("Enter path to data file: ")
+                binary = input("Is the file raw binary float64 (y/n)? ").strip().lower() == 'y'
+                summary = stats.summarize(path, binary=binary)
+                for name, value in summary.items():
+                    print(f"---{name.replace('_', ' ').title()}: {value}---")
             
             elif operation == 'q':
                 continue
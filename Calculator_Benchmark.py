@@ -0,0 +1,324 @@
+"""
+This is a benchmark suite for the advanced calculator in Calculator.py.
+It runs representative small, medium and large workloads for every calculator class (plotting runs
+headless), reports time and peak memory, and saves the results as JSON so that two runs can be
+compared against a regression threshold. It also checks that a cold `import Calculator` stays within
+an import-time budget and does not load matplotlib, numpy or sympy.
+
+Author: Zane Francis
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Plots must render off-screen; set before matplotlib can be imported
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+SIZES = ('small', 'medium', 'large')
+
+# Modules that must not be imported by a bare `import Calculator`
+HEAVY_MODULES = ('matplotlib', 'numpy', 'sympy')
+
+# Default cold import budget in seconds (interpreter start-up is not included)
+IMPORT_BUDGET = 0.1
+
+# Default allowed slowdown before a workload counts as a regression (0.2 = 20% slower)
+REGRESSION_THRESHOLD = 0.2
+
+# Runs in a fresh interpreter so every measurement is a cold import
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import Calculator
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{'seconds': elapsed, 'heavy_modules': heavy}}))
+"""
+
+def measure_import_time(repeats=5):
+    """Import Calculator in `repeats` fresh interpreters and return the timings and any heavy modules seen."""
+    probe = _IMPORT_PROBE.format(heavy=HEAVY_MODULES)
+    timings = []
+    heavy_seen = set()
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', probe],
+            cwd=HERE,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['seconds'])
+        heavy_seen.update(result['heavy_modules'])
+    return timings, sorted(heavy_seen)
+
+def check_import_budget(budget=IMPORT_BUDGET, repeats=5):
+    timings, heavy = measure_import_time(repeats)
+    median = statistics.median(timings)
+    print(f"Cold import of Calculator: median {median * 1000:.1f} ms over {repeats} runs "
+          f"(budget {budget * 1000:.1f} ms)")
+    ok = True
+    if heavy:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(heavy)}")
+        ok = False
+    if median > budget:
+        print("FAIL: import time is over budget")
+        ok = False
+    if ok:
+        print("OK")
+    return ok
+
+#-----------------------------------------------------
+# Workloads: each builder takes a size name and returns a zero-argument callable
+#-----------------------------------------------------
+def _numerics_workloads(calc, np):
+    numerics = calc.Numerics()
+    counts = {'small': 1_000, 'medium': 100_000, 'large': 2_000_000}
+    rng = np.random.default_rng(0)
+
+    def array_gcd(size):
+        a = rng.integers(1, 10 ** 9, counts[size])
+        b = rng.integers(1, 10 ** 9, counts[size])
+        return lambda: numerics.greatest_common_divisor(a, b)
+
+    def array_division(size):
+        a = rng.random(counts[size])
+        b = rng.random(counts[size]) + 1
+        return lambda: numerics.basic_operations(a, b, '/')
+
+    def scalar_lcm(size):
+        pairs = [(int(a), int(b)) for a, b in rng.integers(1, 10 ** 6, (counts[size] // 100, 2))]
+        return lambda: [numerics.least_common_multiple(a, b) for a, b in pairs]
+
+    return {'array_gcd': array_gcd, 'array_division': array_division, 'scalar_lcm': scalar_lcm}
+
+def _algebra_workloads(calc, np):
+    algebra = calc.Algebra()
+    degrees = {'small': 4, 'medium': 10, 'large': 20}
+    counts = {'small': 1_000, 'medium': 100_000, 'large': 2_000_000}
+    frequencies = {'small': 2, 'medium': 20, 'large': 200}
+
+    def factor_polynomial(size):
+        expr = ' * '.join(f'(x - {k})' for k in range(1, degrees[size] + 1))
+        expanded = str(algebra.expand_polynomial(expr))
+        return lambda: algebra.factor_polynomial(expanded)
+
+    def numeric_roots(size):
+        func = f'sin({frequencies[size]}*x) - 0.3*x'
+        return lambda: algebra.zero_of_function(func, 'x', method='numeric', interval=(-5, 5))
+
+    def quadratic_arrays(size):
+        rng = np.random.default_rng(1)
+        a, b, c = (rng.random(counts[size]) for _ in range(3))
+        return lambda: algebra.solve_quadratic(a, b, c)
+
+    return {'factor_polynomial': factor_polynomial, 'numeric_roots': numeric_roots,
+            'quadratic_arrays': quadratic_arrays}
+
+def _calculus_workloads(calc, np):
+    calculus = calc.Calculus()
+    orders = {'small': 4, 'medium': 8, 'large': 14}
+    terms = {'small': 10_000, 'medium': 1_000_000, 'large': 100_000_000}
+    points = {'small': 1_000, 'medium': 100_000, 'large': 2_000_000}
+
+    def taylor_series(size):
+        # Clear the derivative cache so every run differentiates from scratch
+        def run():
+            calc.derivative_cache.clear()
+            return calculus.taylor_series('exp(sin(x))', 'x', 0, orders[size])
+        return run
+
+    def numeric_integral(size):
+        upper = {'small': 10, 'medium': 100, 'large': 1_000}[size]
+        return lambda: calculus.integral_definite('sin(x**2)/(1 + x)', 'x', 0, upper, method='numeric')
+
+    def numeric_series(size):
+        return lambda: calculus.sum_of_series('sin(n)/n**2', 'n', terms[size], method='numeric')
+
+    def derivative_sweep(size):
+        x = np.linspace(-5, 5, points[size])
+        return lambda: calculus.derrivative_at_point('exp(-x**2)*cos(3*x)', 'x', x)
+
+    return {'taylor_series': taylor_series, 'numeric_integral': numeric_integral,
+            'numeric_series': numeric_series, 'derivative_sweep': derivative_sweep}
+
+def _statistics_workloads(calc, np):
+    stats = calc.StatisticalProbability()
+    n_values = {'small': 1_000, 'medium': 100_000, 'large': 1_000_000}
+    counts = {'small': 10_000, 'medium': 1_000_000, 'large': 10_000_000}
+
+    def combinations(size):
+        n = n_values[size]
+        return lambda: stats.combinations(n, n // 3)
+
+    def table_combinations(size):
+        table = stats.factorial_table(10 ** 6, 10 ** 9 + 7)
+        rng = np.random.default_rng(2)
+        n = rng.integers(0, 10 ** 6, counts[size])
+        r = rng.integers(0, 10 ** 6, counts[size])
+        return lambda: table.combinations(n, r)
+
+    def streaming_summary(size):
+        data = np.random.default_rng(3).normal(size=counts[size])
+
+        def run():
+            summary = calc.StreamingStatistics()
+            for start in range(0, data.size, 1 << 18):
+                summary.update(data[start:start + (1 << 18)])
+            return summary.summary()
+        return run
+
+    return {'combinations': combinations, 'table_combinations': table_combinations,
+            'streaming_summary': streaming_summary}
+
+def _plotting_workloads(calc, np):
+    plotting = calc.Plotting()
+    counts = {'small': 1_000, 'medium': 100_000, 'large': 5_000_000}
+    resolutions = {'small': 100, 'medium': 500, 'large': 2_000}
+
+    def plot_function(size):
+        upper = {'small': 10, 'medium': 100, 'large': 1_000}[size]
+        # Rendering into an in-memory PNG forces the drawing work that plt.show() does on screen
+        return lambda: plotting.plot_function('tan(x) + sin(5*x)', 'x', (0, upper), path=io.BytesIO())
+
+    def plot_data(size):
+        rng = np.random.default_rng(4)
+        x, y = rng.random(counts[size]), rng.random(counts[size])
+        return lambda: plotting.plot_data(x, y, path=io.BytesIO())
+
+    def surface_values(size):
+        return lambda: plotting.surface_values('sin(x)*cos(y)', 'x', 'y', (-3, 3), (-3, 3),
+                                               resolution=resolutions[size])
+
+    def render_files(size):
+        # Headless rendering straight to PNG files, one reused figure for every job; the
+        # images are deleted again after every run
+        def run():
+            with tempfile.TemporaryDirectory(prefix='calculator-bench-') as directory:
+                jobs = [{'method': 'plot_function', 'args': [f'sin({k}*x)', 'x', [0, 10]],
+                         'path': os.path.join(directory, f'plot{k}.png')}
+                        for k in range({'small': 4, 'medium': 16, 'large': 64}[size])]
+                return calc.render_plots(jobs, workers=1)
+        return run
+
+    return {'plot_function': plot_function, 'plot_data': plot_data, 'surface_values': surface_values,
+            'render_files': render_files}
+
+WORKLOAD_GROUPS = {
+    'numerics': _numerics_workloads,
+    'algebra': _algebra_workloads,
+    'calculus': _calculus_workloads,
+    'statistical_probability': _statistics_workloads,
+    'plotting': _plotting_workloads,
+}
+
+#-----------------------------------------------------
+# Measurement, reporting and comparison
+#-----------------------------------------------------
+def measure(run, repeats):
+    """Time `run` `repeats` times after one warm-up call, then measure its peak traced memory once."""
+    run()
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'median_seconds': statistics.median(timings),
+        'min_seconds': min(timings),
+        'peak_bytes': peak,
+        'repeats': repeats,
+    }
+
+def run_suite(groups=None, sizes=SIZES, repeats=3):
+    import Calculator as calc
+    import numpy as np
+
+    results = {}
+    for group_name, build_group in WORKLOAD_GROUPS.items():
+        if groups and group_name not in groups:
+            continue
+        for workload_name, build in build_group(calc, np).items():
+            for size in sizes:
+                key = f"{group_name}.{workload_name}/{size}"
+                result = measure(build(size), repeats)
+                results[key] = result
+                print(f"{key:<50} {result['median_seconds'] * 1000:>10.2f} ms "
+                      f"{result['peak_bytes'] / 2 ** 20:>9.1f} MiB peak")
+    return results
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print workloads that got slower than baseline by more than threshold; return their names."""
+    regressions = []
+    for key, result in sorted(results.items()):
+        if key not in baseline:
+            continue
+        before = baseline[key]['median_seconds']
+        after = result['median_seconds']
+        ratio = after / before if before > 0 else float('inf')
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            print(f"REGRESSION {key}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms ({ratio:.2f}x)")
+    if not regressions:
+        print(f"No regressions above {threshold:.0%}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for Calculator.py")
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET,
+                        help="cold import budget in seconds")
+    parser.add_argument('--import-only', action='store_true',
+                        help="only check the cold import budget")
+    parser.add_argument('--groups', nargs='+', choices=sorted(WORKLOAD_GROUPS),
+                        help="only run these workload groups")
+    parser.add_argument('--sizes', nargs='+', choices=SIZES, default=list(SIZES),
+                        help="input sizes to run")
+    parser.add_argument('--repeats', type=int, default=3,
+                        help="timed runs per workload (and fresh interpreters for the import check)")
+    parser.add_argument('--output', metavar='PATH',
+                        help="save results as JSON")
+    parser.add_argument('--compare', metavar='PATH',
+                        help="baseline JSON from an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed slowdown before a workload is a regression (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    ok = check_import_budget(args.budget, max(args.repeats, 3))
+    if args.import_only:
+        sys.exit(0 if ok else 1)
+
+    results = run_suite(args.groups, args.sizes, args.repeats)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results,
+            }, handle, indent=2)
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)['results']
+        ok = not compare(results, baseline, args.threshold) and ok
+    sys.exit(0 if ok else 1)
@@ -4,8 +4,17 @@ It categorizes files into folders such as Images, Documents, Videos, Music, and
 
 Author: Zane Francis
 """
+import argparse
+import errno
+import hashlib
+import json
 import os
 import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 # Resolve the Downloads folder, preferring an existing path (OneDrive vs local).
 candidate_sources = [
@@ -26,54 +35,714 @@ target_dirs = {
 # Skip active/incomplete downloads and temporary files.
 ignored_extensions = {'.crdownload', '.part', '.tmp', '.download'}
 
-def move_file_safe(src_path: str, dest_dir: str, filename: str) -> None:
-    """Move file to dest_dir, auto-renaming to avoid collisions."""
-    base, ext = os.path.splitext(filename)
-    candidate = filename
-    counter = 1
+# Extension -> category lookup, built once instead of scanning every list per file
+extension_categories = {ext: folder for folder, extensions in target_dirs.items() for ext in extensions}
 
-    while os.path.exists(os.path.join(dest_dir, candidate)):
-        candidate = f"{base} ({counter}){ext}"
-        counter += 1
+# Number of threads moving files at once
+default_workers = 8
 
-    shutil.move(src_path, os.path.join(dest_dir, candidate))
+# Dedup stage: bytes hashed from each end of a file before committing to a full hash, and read size
+sample_bytes = 64 * 1024
+chunk_bytes = 1024 * 1024
 
-def organize_files():
+# Recursive mode: append-only record of planned and finished moves, used to resume and roll back
+journal_file = os.path.join(os.path.expanduser('~'), '.file_organizer_journal.jsonl')
+
+# Watch mode: where the directory index is kept, how often to look, and how long a file
+# must go unmodified before it counts as a finished download
+state_file = os.path.join(os.path.expanduser('~'), '.file_organizer_state.json')
+watch_interval = 2.0
+settle_seconds = 5.0
+
+class NameIndex:
+    """Hands out free file names in one destination folder without probing name (1), name (2), ...
+
+    The folder is listed once; after that, every base name remembers its next free suffix.
+    Names are handed out under a lock, so two workers never get the same one. Nothing is written
+    to disk until the file itself arrives, and move_file never replaces an existing file, so a
+    name another process took since the listing is skipped rather than overwritten.
+    """
+
+    def __init__(self, dest_dir: str):
+        self.dest_dir = dest_dir
+        self._lock = threading.Lock()
+        with os.scandir(dest_dir) as entries:
+            self._taken = {entry.name for entry in entries}
+        self._next_suffix: Dict[str, int] = {}
+
+    def reserve(self, filename: str) -> str:
+        """Claim the next free name for filename and return its path."""
+        base, ext = os.path.splitext(filename)
+        with self._lock:
+            counter = self._next_suffix.get(filename, 0)
+            while True:
+                candidate = filename if counter == 0 else f"{base} ({counter}){ext}"
+                counter += 1
+                if candidate not in self._taken:
+                    self._taken.add(candidate)
+                    self._next_suffix[filename] = counter
+                    return os.path.join(self.dest_dir, candidate)
+
+    def release(self, filename: str, path: str) -> None:
+        # Give back a name whose move failed; the next reservation for filename starts over
+        # from the lowest suffix (an in-memory walk, no system calls)
+        with self._lock:
+            self._taken.discard(os.path.basename(path))
+            self._next_suffix.pop(filename, None)
+
+# One index per destination folder, rebuilt at the start of each organize_files run and of
+# each watch pass that has files to move
+_name_indexes: Dict[str, NameIndex] = {}
+_name_indexes_guard = threading.Lock()
+
+def name_index(dest_dir: str) -> NameIndex:
+    with _name_indexes_guard:
+        index = _name_indexes.get(dest_dir)
+        if index is None:
+            index = _name_indexes[dest_dir] = NameIndex(dest_dir)
+        return index
+
+def reset_name_indexes() -> None:
+    with _name_indexes_guard:
+        _name_indexes.clear()
+
+def category_for(filename: str) -> Optional[str]:
+    """Return the category folder for filename, or None if the file should be left alone."""
+    file_ext = os.path.splitext(filename)[1].lower()
+    if file_ext in ignored_extensions:
+        return None
+    return extension_categories.get(file_ext, 'Others')
+
+def move_file(src_path: str, dest_path: str) -> None:
+    """Move a file without ever replacing one at dest_path; raises FileExistsError instead.
+
+    On one filesystem this is a hard link plus an unlink, so the new name appears atomically and
+    complete. Where hard links are unavailable (another device, FAT, some network shares) it
+    falls back to shutil.move once the name has been checked to be free.
+    """
+    try:
+        os.link(src_path, dest_path, follow_symlinks=False)
+    except FileExistsError:
+        raise
+    except (OSError, NotImplementedError):
+        if os.path.lexists(dest_path):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dest_path)
+        shutil.move(src_path, dest_path)
+        return
+    os.unlink(src_path)
+
+def move_file_safe(src_path: str, dest_dir: str, filename: str) -> str:
+    """Move file to dest_dir, auto-renaming to avoid collisions. Returns the new path."""
+    index = name_index(dest_dir)
+    while True:
+        dest_path = index.reserve(filename)
+        try:
+            move_file(src_path, dest_path)
+            return dest_path
+        except FileExistsError:
+            continue  # Created by another process since the folder was listed; try the next name
+        except BaseException:
+            index.release(filename, dest_path)
+            raise
+
+def _move_entry(src_path: str, dest_dir: str, filename: str) -> int:
+    # Size is read before the move
+    size = os.lstat(src_path).st_size
+    move_file_safe(src_path, dest_dir, filename)
+    return size
+
+def make_summary(moved: int, moved_bytes: int, failed: int, seconds: float) -> dict:
+    return {
+        'files': moved,
+        'bytes': moved_bytes,
+        'failed': failed,
+        'seconds': seconds,
+        'files_per_second': moved / seconds if seconds else 0.0,
+        'bytes_per_second': moved_bytes / seconds if seconds else 0.0,
+    }
+
+def run_moves(moves: Iterable[Tuple[str, str, str]], workers: int = default_workers,
+              move: Callable[[str, str, str], int] = _move_entry,
+              pool: Optional[ThreadPoolExecutor] = None) -> dict:
+    """Run (filename, src_path, dest_dir) moves in a bounded thread pool and return a summary.
+
+    move(src_path, dest_dir, filename) does the work and returns the bytes moved. Pass pool to
+    share one executor between calls. The summary has the files and bytes moved, failures
+    (with the source paths that failed in 'failed_paths') and throughput.
+    """
+    if pool is None:
+        with ThreadPoolExecutor(workers) as pool:
+            return run_moves(moves, workers, move, pool)
+    start = time.perf_counter()
+    moved = moved_bytes = 0
+    failed_paths = []
+
+    def collect(filename, src_path, future):
+        nonlocal moved, moved_bytes
+        try:
+            moved_bytes += future.result()
+            moved += 1
+        except Exception as exc:  # Keep processing on individual file failures
+            failed_paths.append(src_path)
+            print(f"Skipped {filename}: {exc}")
+
+    # Only a few moves per worker are queued, so memory stays flat however many files there are
+    pending = deque()
+    for filename, src_path, dest_dir in moves:
+        pending.append((filename, src_path, pool.submit(move, src_path, dest_dir, filename)))
+        if len(pending) >= workers * 4:
+            collect(*pending.popleft())
+    while pending:
+        collect(*pending.popleft())
+
+    summary = make_summary(moved, moved_bytes, len(failed_paths), time.perf_counter() - start)
+    summary['failed_paths'] = failed_paths
+    return summary
+
+#-----------------------------------------------------
+# Duplicate detection
+#-----------------------------------------------------
+def file_digest(path: str, head_tail: bool = False) -> bytes:
+    """Hash a file in fixed-size chunks, or only its first and last sample_bytes if head_tail is set."""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, 'rb', buffering=0) as handle:
+        if head_tail:
+            digest.update(handle.read(sample_bytes))
+            size = os.fstat(handle.fileno()).st_size
+            if size > sample_bytes:
+                handle.seek(max(sample_bytes, size - sample_bytes))
+                digest.update(handle.read(sample_bytes))
+            return digest.digest()
+        # One reusable buffer, so memory stays flat however large the file is
+        buffer = bytearray(chunk_bytes)
+        view = memoryview(buffer)
+        while True:
+            count = handle.readinto(buffer)
+            if not count:
+                break
+            digest.update(view[:count])
+    return digest.digest()
+
+def find_duplicate_groups(paths_by_size: Dict[int, List[str]], workers: int = default_workers) -> List[List[str]]:
+    """Return groups of paths with identical contents among files of equal size.
+
+    Only sizes shared by several files are hashed: first a cheap head/tail hash, then a full
+    chunked hash of whatever still collides. Hashing runs in a thread pool. Files that vanish
+    or cannot be read are left out of every group.
+    """
+    groups = [(size, paths) for size, paths in paths_by_size.items() if len(paths) > 1]
+
+    def digest_or_none(path, head_tail):
+        try:
+            return file_digest(path, head_tail)
+        except OSError as exc:
+            print(f"Not checked for duplicates {path}: {exc}")
+            return None
+
+    with ThreadPoolExecutor(workers) as pool:
+        for head_tail in (True, False):
+            # Files no longer than the two samples were already hashed in full
+            candidates = [path for size, paths in groups
+                          if head_tail or size > 2 * sample_bytes for path in paths]
+            digests = dict(zip(candidates, pool.map(lambda path: digest_or_none(path, head_tail), candidates)))
+            refined = []
+            for size, paths in groups:
+                buckets: Dict[bytes, List[str]] = {}
+                for path in paths:
+                    digest = digests.get(path, b'')
+                    if digest is not None:
+                        buckets.setdefault(digest, []).append(path)
+                refined.extend((size, bucket) for bucket in buckets.values() if len(bucket) > 1)
+            groups = refined
+    return [paths for size, paths in groups]
+
+def collapse_duplicate(keeper: str, duplicate: str, mode: str) -> None:
+    """Delete duplicate, or turn it into a hard link to keeper so both names share one copy."""
+    if mode == 'delete':
+        os.remove(duplicate)
+        return
+    link_path = f"{duplicate}.{os.getpid()}.link"
+    os.link(keeper, link_path)
+    os.replace(link_path, duplicate)
+
+def deduplicate(moves: List[Tuple[str, str, str]], mode: str,
+                workers: int = default_workers) -> Tuple[List[Tuple[str, str, str]], dict]:
+    """Collapse incoming files that duplicate each other or a file already in their destination.
+
+    mode is 'delete' (drop the duplicate) or 'hardlink' (keep the name, share the data).
+    Returns the moves still to run and a summary of duplicates found and bytes saved.
+    A file that cannot be read is simply not deduplicated; it is still moved as usual.
+    """
+    incoming = {}
+    for move in moves:
+        try:
+            stat = os.lstat(move[1])
+        except OSError:
+            continue  # run_moves reports it
+        if stat.st_size:  # Empty files are left alone
+            incoming[move[1]] = stat
+    incoming_by_size: Dict[int, List[str]] = {}
+    for path, stat in incoming.items():
+        incoming_by_size.setdefault(stat.st_size, []).append(path)
+
+    # Files already organized only matter when an incoming file has the same size
+    existing: Dict[int, List[str]] = {}
+    for dest_dir in {move[2] for move in moves}:
+        try:
+            with os.scandir(dest_dir) as entries:
+                for entry in entries:
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+                    if size in incoming_by_size:
+                        existing.setdefault(size, []).append(entry.path)
+        except OSError as exc:
+            print(f"Not checked for duplicates in {dest_dir}: {exc}")
+    # Organized copies come first so they are the ones kept
+    paths_by_size = {size: existing.get(size, []) + paths for size, paths in incoming_by_size.items()}
+
+    removed = set()
+    duplicates = saved = 0
+    for group in find_duplicate_groups(paths_by_size, workers):
+        # Prefer a copy that is already organized; otherwise keep the first incoming file
+        keeper = group[0]
+        try:
+            keeper_stat = os.lstat(keeper)
+        except OSError:
+            continue
+        for duplicate in group[1:]:
+            if duplicate not in incoming:
+                continue  # Only incoming files are ever collapsed
+            stat = incoming[duplicate]
+            if (stat.st_dev, stat.st_ino) == (keeper_stat.st_dev, keeper_stat.st_ino):
+                continue  # Already the same file
+            try:
+                collapse_duplicate(keeper, duplicate, mode)
+            except OSError as exc:  # e.g. hard links across filesystems
+                print(f"Kept duplicate {duplicate}: {exc}")
+                continue
+            duplicates += 1
+            saved += stat.st_size
+            if mode == 'delete':
+                removed.add(duplicate)
+
+    remaining = [move for move in moves if move[1] not in removed]
+    return remaining, {'duplicates': duplicates, 'bytes_saved': saved}
+
+def create_target_dirs(source: str) -> None:
     # Create target directories if they don't exist
     for folder in target_dirs.keys():
-        folder_path = os.path.join(source_dir, folder)
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
-    
-    # Iterate through files in the source directory
-    for filename in os.listdir(source_dir):
-        file_path = os.path.join(source_dir, filename)
-
-        # Skip directories
-        if os.path.isdir(file_path):
-            continue
+        os.makedirs(os.path.join(source, folder), exist_ok=True)
+
+def organize_files(source: Optional[str] = None, workers: int = default_workers,
+                   dedup: Optional[str] = None) -> dict:
+    """Sort the files in source (default: source_dir) into category folders.
+
+    Directory entries come from os.scandir and moves run in a bounded thread pool.
+    With dedup set to 'delete' or 'hardlink', duplicate contents are collapsed first.
+    Returns the summary from run_moves.
+    """
+    source = source or source_dir
+    create_target_dirs(source)
+    reset_name_indexes()
+    unreadable = 0
+
+    def planned_moves():
+        nonlocal unreadable
+        with os.scandir(source) as entries:
+            for entry in entries:
+                try:
+                    # Skip directories (including the category folders) and ignored files
+                    if entry.is_dir():
+                        continue
+                    folder = category_for(entry.name)
+                except OSError as exc:
+                    unreadable += 1
+                    print(f"Skipped {entry.name}: {exc}")
+                    continue
+                if folder is not None:
+                    yield entry.name, entry.path, os.path.join(source, folder)
+
+    moves = planned_moves()
+    dedup_summary = {}
+    if dedup:
+        moves, dedup_summary = deduplicate(list(moves), dedup, workers)
+    summary = run_moves(moves, workers)
+    summary['failed'] += unreadable
+    summary.update(dedup_summary)
+    return summary
 
+#-----------------------------------------------------
+# Recursive mode with a move journal
+#-----------------------------------------------------
+class MoveJournal:
+    """Append-only JSON-lines journal of recursive runs.
+
+    Each run starts with a 'start' record. Then come 'plan' (src, dest) before each move,
+    'done' (src) after it, and 'dir_done' once a folder and everything below it is
+    organized. A run ends with 'finish', or with 'rollback' after it has been undone.
+    Only the latest run is ever resumed or rolled back, so starting a new run moves the
+    previous journal aside to <path>.1; reading it back never costs more than one run.
+    """
+
+    def __init__(self, path: str = journal_file):
+        self.path = path
+        self._lock = threading.Lock()
+        self._handle = None
+
+    def load(self, keep_moves: bool = False) -> Optional[dict]:
+        """Read back the latest run: its source, status, finished folders and unfinished plans.
+
+        With keep_moves, also returns every finished (src, dest) move, in order.
+        """
+        run = None
         try:
-            # Get the file extension
-            file_ext = os.path.splitext(filename)[1].lower()
+            handle = open(self.path)
+        except FileNotFoundError:
+            return None
+        with handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # A torn last line from a crash
+                op = record['op']
+                if op == 'start':
+                    run = {'source': record['source'], 'status': 'running', 'done_dirs': set(),
+                           'open_plans': {}, 'moves': []}
+                elif run is None:
+                    continue
+                elif op == 'plan':
+                    run['open_plans'][record['src']] = record['dest']
+                elif op == 'done':
+                    dest = run['open_plans'].pop(record['src'], None)
+                    if keep_moves and dest is not None:
+                        run['moves'].append((record['src'], dest))
+                elif op == 'dir_done':
+                    run['done_dirs'].add(record['dir'])
+                elif op in ('finish', 'rollback'):
+                    run['status'] = op
+        return run
+
+    def write(self, op: str, sync: bool = False, **fields) -> None:
+        with self._lock:
+            if self._handle is None:
+                self._handle = open(self.path, 'a')
+            self._handle.write(json.dumps(dict(op=op, **fields)) + '\n')
+            self._handle.flush()
+            if sync:
+                os.fsync(self._handle.fileno())
+
+    def start(self, source: str) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            if os.path.exists(self.path):
+                os.replace(self.path, self.path + '.1')
+        self.write('start', sync=True, source=source)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+def _moved_halfway(src: str, dest: str) -> bool:
+    # A run stopped between move_file's hard link and unlink leaves one file under both names
+    return os.path.lexists(dest) and os.path.samestat(os.lstat(src), os.lstat(dest))
+
+def _settle_open_plans(journal: MoveJournal, open_plans: Dict[str, str]) -> None:
+    # Moves that were planned when the last run stopped happened, did not, or stopped halfway
+    for src, dest in open_plans.items():
+        if not os.path.lexists(src):
+            if os.path.lexists(dest):
+                journal.write('done', src=src)
+        elif _moved_halfway(src, dest):
+            os.unlink(src)
+            journal.write('done', src=src)
+
+def organize_tree(source: Optional[str] = None, workers: int = default_workers,
+                  journal_path: str = journal_file) -> dict:
+    """Sort every file below source (default: source_dir) into the category folders at its top level.
+
+    Folders are walked depth-first, one scandir listing at a time, so memory depends on the tree's
+    depth rather than its size. Every move is journaled. If the latest run in the journal stopped
+    partway for this source, it is resumed, and folders it finished are not scanned again.
+    """
+    source = os.path.abspath(source or source_dir)
+    create_target_dirs(source)
+    reset_name_indexes()
+    journal = MoveJournal(journal_path)
+    run = journal.load()
+    if run is not None and run['source'] == source and run['status'] == 'running':
+        _settle_open_plans(journal, run['open_plans'])
+        done_dirs = run['done_dirs']
+    else:
+        journal.start(source)
+        done_dirs = set()
+    category_dirs = {os.path.join(source, folder) for folder in target_dirs}
+    journal_abspath = os.path.abspath(journal_path)
+
+    def journaled_move(src_path: str, dest_dir: str, filename: str) -> int:
+        size = os.lstat(src_path).st_size
+        index = name_index(dest_dir)
+        while True:
+            dest_path = index.reserve(filename)
+            journal.write('plan', src=src_path, dest=dest_path)
+            try:
+                move_file(src_path, dest_path)
+                break
+            except FileExistsError:
+                continue  # Taken by another process; plan the next name
+            except BaseException:
+                index.release(filename, dest_path)
+                raise
+        journal.write('done', src=src_path)
+        return size
+
+    start = time.perf_counter()
+    moved = moved_bytes = failed = 0
+    # Each frame is [folder, iterator over its subfolders (None until listed), no failures below]
+    stack = [[source, None, True]]
+    try:
+        with ThreadPoolExecutor(workers) as pool:
+            while stack:
+                frame = stack[-1]
+                path, children, clean = frame
+                if children is None:
+                    if path in done_dirs:
+                        stack.pop()
+                        continue
+                    subdirs = []
+
+                    def planned_moves(path=path, subdirs=subdirs):
+                        # Files are streamed to the movers; only subfolder names are kept
+                        with os.scandir(path) as entries:
+                            for entry in entries:
+                                try:
+                                    if entry.is_dir(follow_symlinks=False):
+                                        if entry.path not in category_dirs:
+                                            subdirs.append(entry.path)
+                                        continue
+                                    if entry.is_dir():
+                                        continue  # Symlinks to folders are left alone
+                                except OSError as exc:
+                                    print(f"Skipped {entry.path}: {exc}")
+                                    continue
+                                folder = category_for(entry.name)
+                                if folder is not None and entry.path != journal_abspath:
+                                    yield entry.name, entry.path, os.path.join(source, folder)
+
+                    try:
+                        summary = run_moves(planned_moves(), workers, journaled_move, pool)
+                    except OSError as exc:  # The folder itself could not be listed
+                        print(f"Skipped {path}: {exc}")
+                        summary = make_summary(0, 0, 1, 0.0)
+                    moved += summary['files']
+                    moved_bytes += summary['bytes']
+                    failed += summary['failed']
+                    frame[1] = iter(subdirs)
+                    frame[2] = clean and not summary['failed']
+                    continue
+                child = next(children, None)
+                if child is not None:
+                    stack.append([child, None, True])
+                    continue
+                # Folder and everything below it are done; a resumed run can skip the whole subtree
+                stack.pop()
+                if clean:
+                    journal.write('dir_done', sync=True, dir=path)
+                elif stack:
+                    stack[-1][2] = False
+        journal.write('finish', sync=True)
+    finally:
+        journal.close()
+    return make_summary(moved, moved_bytes, failed, time.perf_counter() - start)
 
-            if file_ext in ignored_extensions:
+def _restore_entry(current_path: str, original_path: str, filename: str) -> int:
+    # Put one journaled file back where it came from; move_file never replaces something new
+    size = os.lstat(current_path).st_size
+    os.makedirs(os.path.dirname(original_path), exist_ok=True)
+    move_file(current_path, original_path)
+    return size
+
+def rollback(journal_path: str = journal_file, workers: int = default_workers) -> dict:
+    """Undo every move of the latest recursive run in the journal, in one batch."""
+    journal = MoveJournal(journal_path)
+    run = journal.load(keep_moves=True)
+    if run is None or run['status'] == 'rollback':
+        return make_summary(0, 0, 0, 0.0)
+    moves = run['moves']
+    for src, dest in run['open_plans'].items():
+        if not os.path.lexists(src):
+            moves.append((src, dest))
+        elif _moved_halfway(src, dest):
+            os.unlink(dest)  # Undo the hard link of a move that never finished
+    summary = run_moves(((os.path.basename(src), dest, src) for src, dest in reversed(moves)),
+                        workers, _restore_entry)
+    try:
+        journal.write('rollback', sync=True)
+    finally:
+        journal.close()
+    return summary
+
+#-----------------------------------------------------
+# Watch mode
+#-----------------------------------------------------
+class DirectoryIndex:
+    """What the watched folder looked like on the last pass, saved between runs.
+
+    Keeps the folder's own mtime plus [inode, size, mtime_ns, status] for every file that was
+    left in place: 'pending' for downloads that are still settling, 'skipped' for ignored files.
+    """
+
+    def __init__(self, source: str, path: str = state_file):
+        self.source = os.path.abspath(source)
+        self.path = path
+        self.dir_mtime_ns: Optional[int] = None
+        self.entries: Dict[str, list] = {}
+        try:
+            with open(path) as handle:
+                state = json.load(handle)
+            if state.get('source') == self.source:
+                self.dir_mtime_ns = state['dir_mtime_ns']
+                self.entries = state['entries']
+        except (OSError, ValueError, KeyError):
+            pass  # Missing or unreadable state: the first pass scans everything
+
+    def save(self) -> None:
+        # Write to a temporary file first so a crash never leaves a half-written index
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as handle:
+            json.dump({'source': self.source, 'dir_mtime_ns': self.dir_mtime_ns, 'entries': self.entries}, handle)
+        os.replace(temp_path, self.path)
+
+def _changed_files(source: str, index: DirectoryIndex, dir_mtime_ns: int):
+    # Yield (name, stat) for the files worth looking at on this pass
+    if dir_mtime_ns == index.dir_mtime_ns:
+        # Nothing was added, removed or renamed: only re-check downloads that are still settling
+        for name, record in list(index.entries.items()):
+            if record[3] == 'pending':
+                try:
+                    yield name, os.lstat(os.path.join(source, name))
+                except FileNotFoundError:
+                    del index.entries[name]
+        return
+    present = set()
+    with os.scandir(source) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
                 continue
-            moved = False
-
-            # Check which category the file belongs to and move it
-            for folder, extensions in target_dirs.items():
-                if file_ext in extensions:
-                    move_file_safe(file_path, os.path.join(source_dir, folder), filename)
-                    moved = True
-                    break
-            
-            # If the file doesn't match any category, move it to 'Others'
-            if not moved:
-                move_file_safe(file_path, os.path.join(source_dir, 'Others'), filename)
-        except Exception as exc:  # Keep processing on individual file failures
-            print(f"Skipped {filename}: {exc}")
-        
+            present.add(entry.name)
+            yield entry.name, stat
+    for name in set(index.entries) - present:
+        del index.entries[name]
+
+def watch_pass(source: str, index: DirectoryIndex, settle: float = settle_seconds,
+               workers: int = default_workers) -> dict:
+    """Move the files that are new or changed since the last pass and have finished downloading.
+
+    When the folder's mtime is unchanged, only files still settling are stat'ed, so a quiet
+    pass costs a handful of system calls however large the folder is.
+    """
+    now = time.time()
+    dir_stat = os.stat(source)
+    old_state = (index.dir_mtime_ns, dict(index.entries))
+    moves = []
+    signatures = {}
+    for name, stat in _changed_files(source, index, dir_stat.st_mtime_ns):
+        signature = [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+        previous = index.entries.get(name)
+        if previous is not None and previous[:3] == signature and previous[3] == 'skipped':
+            continue
+        folder = category_for(name)
+        if folder is None:
+            index.entries[name] = signature + ['skipped']
+            continue
+        # A download is finished once it has stopped growing and has not been written to for a while
+        settled = (now - stat.st_mtime >= settle
+                   and (previous is None or previous[1] == stat.st_size))
+        if not settled:
+            index.entries[name] = signature + ['pending']
+            continue
+        index.entries.pop(name, None)
+        signatures[name] = signature
+        moves.append((name, os.path.join(source, name), os.path.join(source, folder)))
+
+    # An mtime this close to now may not reflect files created in the same clock tick, so it
+    # is not trusted to skip the next scan
+    index.dir_mtime_ns = dir_stat.st_mtime_ns if now - dir_stat.st_mtime > 2.0 else None
+    if moves:
+        # Files may have been moved out of or deleted from the category folders since the last
+        # pass, so list them afresh rather than keep every name ever seen
+        reset_name_indexes()
+    summary = run_moves(moves, workers)
+    # A failed move (e.g. a file still locked on Windows) leaves the folder's mtime unchanged,
+    # so keep the file pending; it is re-stat'ed and retried on the next pass
+    for path in summary['failed_paths']:
+        name = os.path.basename(path)
+        index.entries[name] = signatures[name] + ['pending']
+    if (index.dir_mtime_ns, index.entries) != old_state:
+        index.save()
+    return summary
+
+def watch(source: Optional[str] = None, interval: float = watch_interval, settle: float = settle_seconds,
+          state_path: str = state_file, workers: int = default_workers) -> None:
+    """Keep organizing source until interrupted, handling only new or changed files on each pass."""
+    source = source or source_dir
+    create_target_dirs(source)
+    index = DirectoryIndex(source, state_path)
+    while True:
+        summary = watch_pass(source, index, settle, workers)
+        if summary['files'] or summary['failed']:
+            print_summary(summary)
+        time.sleep(interval)
+
+def print_summary(summary: dict) -> None:
+    print(f"Moved {summary['files']} files ({summary['bytes'] / 2 ** 20:.1f} MiB) in "
+          f"{summary['seconds']:.2f} s: {summary['files_per_second']:.0f} files/s, "
+          f"{summary['bytes_per_second'] / 2 ** 20:.1f} MiB/s ({summary['failed']} skipped)")
+    if 'duplicates' in summary:
+        print(f"Collapsed {summary['duplicates']} duplicates, saving {summary['bytes_saved'] / 2 ** 20:.1f} MiB")
+
 if __name__ == "__main__":
-    organize_files()
-    print("Files have been organized successfully.")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Sort downloaded files into category folders.")
+    parser.add_argument('--source', default=source_dir, help="folder to organize (default: Downloads)")
+    parser.add_argument('--workers', type=int, default=default_workers, help="threads moving files")
+    parser.add_argument('--dedup', choices=('delete', 'hardlink'),
+                        help="collapse files with identical contents before organizing")
+    parser.add_argument('--recursive', action='store_true',
+                        help="organize files in all subfolders too, resuming an interrupted run")
+    parser.add_argument('--journal', default=journal_file, help="where recursive runs record their moves")
+    parser.add_argument('--rollback', action='store_true',
+                        help="undo the latest recursive run recorded in the journal")
+    parser.add_argument('--watch', action='store_true', help="keep running and organize new files as they arrive")
+    parser.add_argument('--interval', type=float, default=watch_interval, help="seconds between watch passes")
+    parser.add_argument('--settle', type=float, default=settle_seconds,
+                        help="seconds a file must go unmodified before it is moved in watch mode")
+    parser.add_argument('--state', default=state_file, help="where watch mode keeps its directory index")
+    args = parser.parse_args()
+
+    if args.rollback:
+        summary = rollback(args.journal, args.workers)
+        print(f"Restored {summary['files']} files ({summary['failed']} could not be restored)")
+    elif args.recursive:
+        print_summary(organize_tree(args.source, args.workers, args.journal))
+        print("Files have been organized successfully.")
+    elif args.watch:
+        print(f"Watching {args.source} (Ctrl+C to stop)")
+        try:
+            watch(args.source, args.interval, args.settle, args.state, args.workers)
+        except KeyboardInterrupt:
+            pass
+    else:
+        print_summary(organize_files(args.source, args.workers, args.dedup))
+        print("Files have been organized successfully.")